@@ -0,0 +1,118 @@
+import streamlit as st
+import os, traceback
+
+from utils.app_helpers import setup_page, fingerprint, extract_text, render_first_page, run_gemini, run_gemini_many, show_raw_output, ExtractionFailed
+from utils.data_models import DailyDiaryData
+
+
+setup_page()
+st.header("Upload & Process")
+
+# Initialize session state variables
+if 'uploaded_files' not in st.session_state:
+    st.session_state.uploaded_files = []
+if 'upload_success' not in st.session_state:
+    st.session_state.upload_success = False
+
+# File uploader widget
+uploaded_files = st.file_uploader("Upload site report PDFs", type="pdf", accept_multiple_files=True)
+
+# Handle file selection and persistence
+if uploaded_files and (uploaded_files != st.session_state.uploaded_files):
+    st.session_state.upload_success = False
+    st.session_state.uploaded_files = uploaded_files
+    # Cache keys for the parser and preview, computed once per upload
+    st.session_state.upload_keys = [fingerprint(f.getvalue()) for f in uploaded_files]
+    st.session_state.extracted_data = None
+    st.session_state.ready_for_pdf = False
+    st.session_state.pop('generated_pdf', None)
+    st.session_state.pop('raw_text', None)
+    st.session_state.pop('gemini_response', None)
+    st.session_state.pop('batch_results', None)
+
+if not st.session_state.uploaded_files:
+    st.info("⚠️ Please upload and process a report first.")
+    st.stop()
+
+
+def select_report(index):
+    """Make one processed report the diary to review"""
+    result = st.session_state.batch_results[index]
+    st.session_state.raw_text = result['raw_text']
+    st.session_state.gemini_response = result['response_text']
+    st.session_state.extracted_data = DailyDiaryData.from_json(result['processed']) if result['processed'] else None
+    st.session_state.ready_for_pdf = False
+    st.session_state.pop('generated_pdf', None)
+    st.session_state.review_report = index
+
+
+# Materialize the uploads once; reused for the size display and the parser
+uploads = [(f.name, key, f.getvalue())
+           for f, key in zip(st.session_state.uploaded_files, st.session_state.upload_keys)]
+for name, upload_key, pdf_bytes in uploads:
+    st.json({
+        "File name": name,
+        "File size": f"{len(pdf_bytes) / 1024:.2f} KB"
+    })
+
+with st.expander("👁️ Preview first page"):
+    name, upload_key, pdf_bytes = uploads[0]
+    try:
+        st.image(render_first_page(upload_key, pdf_bytes), caption=name if len(uploads) > 1 else None)
+    except Exception as e:
+        st.warning(f"Could not render preview: {e}")
+
+# Process only when requested
+if st.button("Process PDF" if len(uploads) == 1 else f"Process {len(uploads)} PDFs", key="process_btn") \
+        and not st.session_state.upload_success:
+    try:
+        st.info("📄 Extracting text from PDF...")
+
+        raw_texts = [extract_text(upload_key, pdf_bytes) for _, upload_key, pdf_bytes in uploads]
+
+        st.info("🤖 Sending to Gemini for data extraction...")
+
+        api_key = os.getenv("GOOGLE_API_KEY", "")
+        try:
+            if len(raw_texts) == 1:
+                try:
+                    results = [run_gemini(raw_texts[0], api_key)]
+                except ExtractionFailed as failed:
+                    results = [(None, failed.response_text)]
+            else:
+                results = run_gemini_many(raw_texts, api_key)
+        except Exception as gemini_error:
+            st.error(f"❌ Gemini Error: {gemini_error}")
+            st.stop()
+
+        st.session_state.batch_results = [
+            {'name': name, 'raw_text': raw_text, 'processed': processed, 'response_text': response_text}
+            for (name, _, _), raw_text, (processed, response_text) in zip(uploads, raw_texts, results)
+        ]
+        succeeded = [i for i, result in enumerate(st.session_state.batch_results) if result['processed']]
+        select_report(succeeded[0] if succeeded else 0)
+
+        if succeeded:
+            st.session_state.upload_success = True
+            st.success(f"✅ Structured data extracted from Gemini ({len(succeeded)} of {len(uploads)} reports).")
+        for result in st.session_state.batch_results:
+            if not result['processed']:
+                st.error(f"❌ Gemini did not return structured data for {result['name']}. "
+                         "Check API key, model output, or prompt quality.")
+
+    except Exception as e:
+        st.error(f"❌ General Error: {e}")
+        st.text(traceback.format_exc())
+
+batch_results = st.session_state.get('batch_results')
+if batch_results and len(batch_results) > 1:
+    names = [result['name'] for result in batch_results]
+    chosen = st.selectbox("Report to review", range(len(names)), format_func=names.__getitem__,
+                          key="review_report", on_change=lambda: select_report(st.session_state.review_report))
+    if not batch_results[chosen]['processed']:
+        st.warning(f"No structured data for {names[chosen]}.")
+
+if st.session_state.get('raw_text') is not None:
+    show_raw_output("📄 Extracted Text (Raw)", st.session_state.raw_text, "show_raw_text")
+if st.session_state.get('gemini_response') is not None:
+    show_raw_output("🧠 Gemini Raw Response", st.session_state.gemini_response, "show_gemini_response")
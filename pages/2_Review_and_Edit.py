@@ -0,0 +1,177 @@
+import streamlit as st
+
+from utils.app_helpers import setup_page, records_to_df, editor_changed
+from utils.data_models import ActivityData, EquipmentData, PersonnelData, UnsafeActData, rows_from_dicts
+
+
+WEATHER_OPTIONS = ("Sunny/Dry", "Cloudy", "Rainy", "Stormy")
+
+# Editor columns for each row list, in display order
+ACTIVITY_COLUMNS = ("sn", "description", "location", "quantity", "unit")
+EQUIPMENT_COLUMNS = ("sn", "equipment", "no", "operating_hours", "idle_hours", "status", "remarks")
+PERSONNEL_COLUMNS = ("sn", "personnel", "no", "hours", "role")
+UNSAFE_ACT_COLUMNS = ("sn", "description", "severity", "action_taken")
+
+# Project metadata filled in when Gemini leaves it blank
+PROJECT_DEFAULTS = (
+    ("project", "Construction of Trunk Lines for Kotebe and Kitime Sub-Catchment of Eastern Sewer Line Project"),
+    ("employer", "AAWSA-WISIDD, THE WORLD BANK"),
+    ("consultant", "NICHOLAS O'DWYER LTD. In Jv. with MS CONSULTANCY"),
+    ("contractor", "ASER CONSTRUCTION PLC"),
+)
+
+
+setup_page()
+st.header("Review & Edit")
+data = st.session_state.extracted_data
+
+if not data:
+    st.info("⚠️ Please upload and process a report first.")
+    st.stop()
+
+# Set default metadata if empty
+for field_name, default in PROJECT_DEFAULTS:
+    if not getattr(data, field_name):
+        setattr(data, field_name, default)
+
+with st.form("diary_form"):
+    st.subheader("Project Information")
+    col1, col2 = st.columns(2)
+    data.project = col1.text_input("Project Name", value=data.project)
+    data.contractor = col2.text_input("Contractor", value=data.contractor)
+    data.employer = col1.text_input("Employer", value=data.employer)
+    data.consultant = col2.text_input("Consultant", value=data.consultant)
+    
+    st.divider()
+    st.subheader("Date & Time")
+    date_col, weather_col, time_col = st.columns([2, 2, 1])
+    data.date = date_col.text_input("Date (DD-MM-YYYY)", value=data.date)
+    weather_index = WEATHER_OPTIONS.index(data.weather) if data.weather in WEATHER_OPTIONS else 0
+    data.weather = weather_col.selectbox("Weather", WEATHER_OPTIONS, index=weather_index)
+    st.write("Work Period:")
+    time_col1, time_col2 = st.columns(2)
+    data.time_morning = time_col1.checkbox("Morning", value=data.time_morning)
+    data.time_afternoon = time_col2.checkbox("Afternoon", value=data.time_afternoon)
+    data.location = st.text_input("Location", value=data.location)
+    
+    st.divider()
+    st.subheader("Activities")
+    st.info("Add, edit, or remove activities below")
+    if data.activities:
+        activities_edited = st.data_editor(
+            records_to_df(data.activities, ACTIVITY_COLUMNS),
+            num_rows="dynamic",
+            column_config={
+                "sn": st.column_config.NumberColumn("No.", width="small"),
+                "description": "Description",
+                "location": "Location",
+                "quantity": "Quantity",
+                "unit": "Unit"
+            },
+            use_container_width=True,
+            key="activities_editor"
+        )
+        if editor_changed("activities_editor"):
+            data.activities = rows_from_dicts(ActivityData, activities_edited.to_dict(orient='records'))
+    else:
+        st.warning("No activities extracted. Add new ones below:")
+        if st.button("Add Activity"):
+            data.activities = [ActivityData(sn=1, description="", location="", quantity="", unit="")]
+    
+    st.divider()
+    st.subheader("Equipment")
+    st.info("Review equipment used on site")
+    if data.equipment:
+        equipment_edited = st.data_editor(
+            records_to_df(data.equipment, EQUIPMENT_COLUMNS),
+            num_rows="dynamic",
+            column_config={
+                "sn": st.column_config.NumberColumn("No.", width="small"),
+                "equipment": "Equipment Type",
+                "no": "ID/Number",
+                "operating_hours": "Op. Hours",
+                "idle_hours": "Idle Hours",
+                "status": "Status",
+                "remarks": "Remarks"
+            },
+            use_container_width=True,
+            key="equipment_editor"
+        )
+        if editor_changed("equipment_editor"):
+            data.equipment = rows_from_dicts(EquipmentData, equipment_edited.to_dict(orient='records'))
+    else:
+        st.warning("No equipment information extracted")
+    
+    st.divider()
+    st.subheader("Personnel")
+    st.info("Edit personnel information")
+    if data.personnel:
+        personnel_edited = st.data_editor(
+            records_to_df(data.personnel, PERSONNEL_COLUMNS),
+            num_rows="dynamic",
+            column_config={
+                "sn": st.column_config.NumberColumn("No.", width="small"),
+                "personnel": "Role/Type",
+                "no": "Count",
+                "hours": "Hours",
+                "role": "Specific Role"
+            },
+            use_container_width=True,
+            key="personnel_editor"
+        )
+        if editor_changed("personnel_editor"):
+            data.personnel = rows_from_dicts(PersonnelData, personnel_edited.to_dict(orient='records'))
+    else:
+        st.warning("No personnel information extracted")
+    
+    st.divider()
+    st.subheader("Safety Information")
+    if data.unsafe_acts:
+        st.write("Unsafe Acts/Conditions:")
+        unsafe_edited = st.data_editor(
+            records_to_df(data.unsafe_acts, UNSAFE_ACT_COLUMNS),
+            num_rows="dynamic",
+            column_config={
+                "sn": st.column_config.NumberColumn("No.", width="small"),
+                "description": "Description",
+                "severity": "Severity",
+                "action_taken": "Action Taken"
+            },
+            key="unsafe_acts_editor"
+        )
+        if editor_changed("unsafe_acts_editor"):
+            data.unsafe_acts = rows_from_dicts(UnsafeActData, unsafe_edited.to_dict(orient='records'))
+    else:
+        st.info("No unsafe acts reported")
+    
+    data.near_miss = st.text_area("Near Miss/Accidents/Incidents", value=data.near_miss or "", height=100)
+    data.obstruction = st.text_area("Obstructions/Action Plans", value=data.obstruction or "", height=100)
+    data.engineers_note = st.text_area("Engineer's Notes", value=data.engineers_note or "", height=150)
+    
+    st.divider()
+    st.subheader("Signatures")
+    sig_col1, sig_col2, sig_col3 = st.columns(3)
+    data.prepared_by = sig_col1.text_input("Prepared By", value=data.prepared_by or "")
+    data.checked_by = sig_col2.text_input("Checked By", value=data.checked_by or "")
+    data.approved_by = sig_col3.text_input("Approved By", value=data.approved_by or "")
+    
+    st.divider()
+    st.subheader("Document Details")
+    doc_col1, doc_col2, doc_col3 = st.columns(3)
+    data.document_number = doc_col1.text_input("Document Number", value=data.document_number or "")
+    data.page_number = doc_col2.text_input("Page Number", value=data.page_number or "")
+    data.revision = doc_col3.text_input("Revision", value=data.revision or "")
+    
+    submitted = st.form_submit_button("Save All Changes")
+    if submitted:
+        validation_errors = data.validate()
+        if validation_errors:
+            st.error("Validation errors found:")
+            for error in validation_errors:
+                st.error(f"- {error}")
+        else:
+            st.session_state.extracted_data = data
+            st.session_state.ready_for_pdf = True
+            st.session_state.pop('generated_pdf', None)
+            st.success("✅ All changes saved successfully!")
+            st.rerun()
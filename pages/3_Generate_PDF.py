@@ -0,0 +1,43 @@
+import streamlit as st
+from datetime import datetime
+import tempfile
+import traceback
+
+from utils.app_helpers import setup_page, get_pdf_generator, read_back
+
+# Generated PDFs larger than this are spilled from memory to a temp file
+SPOOL_MAX_BYTES = 8 << 20
+
+setup_page()
+st.header("Generate PDF")
+
+if not st.session_state.get('ready_for_pdf', False):
+    st.warning("⚠️ Please complete and save the review/edit section first")
+    st.stop()
+
+data = st.session_state.extracted_data
+
+if st.button("Generate PDF"):
+    try:
+        gen = get_pdf_generator()
+        output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        gen.generate(data, output)
+        
+        st.session_state.generated_pdf = output
+        st.session_state.generated_pdf_name = f"diary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        st.success("✅ PDF generated successfully!")
+
+    except Exception as e:
+        st.error("❌ PDF generation failed:")
+        st.text(traceback.format_exc())
+
+# Served from session state so the button survives the rerun its own click triggers.
+# The callable defers reading the file until the download is actually requested.
+if st.session_state.get('generated_pdf'):
+    pdf_file = st.session_state.generated_pdf
+    st.download_button(
+        "📥 Download PDF",
+        data=lambda: read_back(pdf_file),
+        file_name=st.session_state.generated_pdf_name,
+        mime="application/pdf"
+    )
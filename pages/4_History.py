@@ -0,0 +1,8 @@
+import streamlit as st
+
+from utils.app_helpers import setup_page
+
+
+setup_page()
+st.header("History")
+st.info("🕓 History feature not implemented yet.")
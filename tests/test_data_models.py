@@ -0,0 +1,55 @@
+"""DailyDiaryData dict/JSON round-trips"""
+
+import json
+
+from utils.data_models import ActivityData, DailyDiaryData, EquipmentData
+
+DIARY = {
+    'project': 'Road Upgrade – Phase 2',
+    'date': '05-03-2025',
+    'time_morning': True,
+    'weather': 'Rainy',
+    'activities': [
+        {'sn': 1, 'description': 'Excavation', 'location': 'CH 120', 'quantity': '40', 'unit': 'm3'},
+    ],
+    'equipment': [
+        {'sn': 1, 'equipment': 'Excavator', 'no': 'EX01', 'operating_hours': '8',
+         'idle_hours': None, 'status': 'Working', 'remarks': None},
+    ],
+    'prepared_by': 'Site Engineer',
+}
+
+
+def test_from_dict_converts_rows_and_fills_defaults():
+    diary = DailyDiaryData.from_dict({**DIARY, 'location': None})
+    assert diary.activities == [ActivityData(1, 'Excavation', 'CH 120', '40', 'm3')]
+    assert diary.equipment == [EquipmentData(1, 'Excavator', 'EX01', '8', None, 'Working', None)]
+    assert diary.location == ''
+    assert diary.personnel == []
+    assert diary.time_afternoon is False
+
+
+def test_to_dict_round_trip():
+    diary = DailyDiaryData.from_dict(DIARY)
+    assert DailyDiaryData.from_dict(diary.to_dict()) == diary
+    assert {key: diary.to_dict()[key] for key in DIARY} == DIARY
+
+
+def test_json_bytes_round_trip():
+    diary = DailyDiaryData.from_dict(DIARY)
+    encoded = diary.to_json_bytes()
+    assert json.loads(encoded) == diary.to_dict()
+    assert DailyDiaryData.from_json(encoded) == diary
+
+
+def test_json_cache_dropped_on_change():
+    diary = DailyDiaryData.from_dict(DIARY)
+    diary.to_json_bytes()
+    diary.project = 'Bridge Works'
+    assert json.loads(diary.to_json_bytes())['project'] == 'Bridge Works'
+
+
+def test_has_content_ignores_defaults():
+    assert not DailyDiaryData().has_content()
+    assert DailyDiaryData(project='Bridge Works').has_content()
+    assert DailyDiaryData.from_dict({'activities': DIARY['activities']}).has_content()
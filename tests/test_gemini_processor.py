@@ -0,0 +1,22 @@
+"""_json_objects: top-level JSON object scanning in model replies"""
+
+from utils.gemini_processor import _json_objects
+
+
+def test_json_objects_in_order():
+    text = 'Here you go: {"a": 1} and {"b": {"c": 2}} done'
+    assert list(_json_objects(text)) == ['{"a": 1}', '{"b": {"c": 2}}']
+
+
+def test_json_objects_skips_braces_in_strings():
+    text = '```json\n{"note": "use } and { freely", "q": "say \\"}\\""}\n```'
+    assert list(_json_objects(text)) == ['{"note": "use } and { freely", "q": "say \\"}\\""}']
+
+
+def test_json_objects_ignores_unbalanced_tail():
+    assert list(_json_objects('{"a": 1} {"b": ')) == ['{"a": 1}']
+    assert list(_json_objects('no json here')) == []
+
+
+def test_json_objects_ignores_stray_closing_brace():
+    assert list(_json_objects('} {"a": 1}')) == ['{"a": 1}']
@@ -0,0 +1,21 @@
+"""_fix_common_ocr_errors against the original per-pattern re.sub version"""
+
+import pytest
+
+from utils.pdf_parser import PDFParser
+
+# input -> output of the original implementation
+OCR_FIX_CASES = [
+    ("Loadingmaterial at the  siteworks\n\nnear excavationarea",
+     "loading material at the site works near excavation area"),
+    ("Pump12 delivered 3bags ofConcreteblocks",
+     "Pump 12 delivered 3 bags of concrete blocks"),
+    ("EQUIPMENTOperation on WORKSITE",
+     "equipment Operation on WORK site"),
+    ("Café  naïve résumé", "Café naïve résumé"),
+]
+
+
+@pytest.mark.parametrize("text, expected", OCR_FIX_CASES)
+def test_fix_common_ocr_errors_matches_original(text, expected):
+    assert PDFParser()._fix_common_ocr_errors(text) == expected
@@ -0,0 +1,36 @@
+"""wrap_lines / fit_with_ellipsis against the original _draw_wrapped_text output"""
+
+import pytest
+
+from utils.text_layout import fit_with_ellipsis, wrap_lines
+
+EXCAVATION = "Excavation of trench for drainage pipe along chainage 120 to 180"
+
+# (text, max_width, font_size, max_lines) -> lines drawn by the original generator
+WRAP_CASES = [
+    (("", 50, 7, 2), ()),
+    (("Short", 50, 7, 1), ("Short",)),
+    ((EXCAVATION, 60, 7, 2), ("Excavation of", "trench for draina...")),
+    ((EXCAVATION, 300, 7, 2), (EXCAVATION,)),
+    (("Supercalifragilisticexpialidocious word", 20, 7, 1), ("",)),
+    (("Concrete pouring at level three slab with pump truck", 80, 8, 3),
+     ("Concrete pouring at", "level three slab with", "pump truck")),
+    (("one two three four five six seven eight nine ten", 40, 7, 1), ("one two...",)),
+]
+
+FIT_CASES = [
+    (("trench for drainage", 60, 7), "trench for draina..."),
+    (("abc", 100, 7), "abc..."),
+    (("Wide", 5, 7), "Wide"),
+    (("MMMMMMMMMM", 30, 8), "MMM..."),
+]
+
+
+@pytest.mark.parametrize("args, expected", WRAP_CASES)
+def test_wrap_lines_matches_original(args, expected):
+    assert wrap_lines(*args) == expected
+
+
+@pytest.mark.parametrize("args, expected", FIT_CASES)
+def test_fit_with_ellipsis_matches_original(args, expected):
+    assert fit_with_ellipsis(*args) == expected
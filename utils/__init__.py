@@ -5,16 +5,27 @@ Utilities package for Daily Site Report to Diary Converter
 __version__ = "1.0.0"
 __author__ = "Daily Diary Converter Team"
 
-# Import main classes for easy access
-from .pdf_parser import PDFParser
-from .gemini_processor import GeminiProcessor
-from .enhanced_pdf_generator import EnhancedPDFGenerator
-from .data_models import DailyDiaryData, SiteReportData
+# Main classes are imported lazily on first access (PEP 562), so importing one
+# submodule doesn't drag in Gemini, ReportLab, OCR and PDF libraries at once
+_LAZY_IMPORTS = {
+    'PDFParser': 'pdf_parser',
+    'GeminiProcessor': 'gemini_processor',
+    'EnhancedPDFGenerator': 'enhanced_pdf_generator',
+    'DailyDiaryData': 'data_models',
+    'SiteReportData': 'data_models'
+}
 
-__all__ = [
-    'PDFParser',
-    'GeminiProcessor', 
-    'EnhancedPDFGenerator',
-    'DailyDiaryData',
-    'SiteReportData'
-]
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    module = importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+    return getattr(module, name)
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
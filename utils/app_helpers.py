@@ -0,0 +1,148 @@
+"""Shared helpers for the Streamlit pages
+Cached resources live here so every page in pages/ hits the same caches
+"""
+
+import hashlib
+import json
+
+import streamlit as st
+import pandas as pd
+
+try:
+    import xxhash  # optional, several times faster than hashlib on large files
+except ImportError:
+    xxhash = None
+
+
+def initialize_session_state():
+    if 'extracted_data' not in st.session_state:
+        st.session_state.extracted_data = None
+    if 'ready_for_pdf' not in st.session_state:
+        st.session_state.ready_for_pdf = False
+
+
+def setup_page():
+    """Common setup at the top of the landing page and every page in pages/"""
+    st.set_page_config(page_title="Aser Diary Converter", layout="centered")
+    initialize_session_state()
+
+
+def records_to_df(records, columns):
+    """Build an editor DataFrame column by column from row dataclasses"""
+    return pd.DataFrame({col: [getattr(record, col) for record in records] for col in columns})
+
+
+def editor_changed(key):
+    """True if the data_editor stored under `key` changed since the last call
+
+    Its edited_rows/added_rows/deleted_rows persist across reruns, so they
+    are compared with the state last seen here; the page rebuilds its rows
+    only on the rerun an edit (or undoing one) triggered. Widgets in a form
+    can't take an on_change callback.
+    """
+    state = st.session_state.get(key)
+    snapshot = json.dumps(state, sort_keys=True, default=str) if state else None
+    seen_key = f"{key}_seen"
+    if st.session_state.get(seen_key) == snapshot:
+        return False
+    st.session_state[seen_key] = snapshot
+    return True
+
+
+def show_raw_output(label, text, key):
+    """Collapsed, opt-in view of a large text blob, so it isn't re-sent on every rerun"""
+    with st.expander(label):
+        if st.checkbox("Show", key=key):
+            st.text_area(label, text, height=300, label_visibility="collapsed")
+
+
+def fingerprint(data: bytes) -> str:
+    """Content key for an uploaded file
+    
+    Computed once per upload and passed to the cached helpers, which skip
+    hashing their `_file_bytes` argument.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_back(file) -> bytes:
+    """Read a generated file from the start, e.g. a SpooledTemporaryFile"""
+    file.seek(0)
+    return file.read()
+
+
+# The heavy dependencies below are imported inside the functions, so a page
+# only pays for the parser, PyMuPDF, Gemini or ReportLab once it uses them
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def extract_text(file_key: str, _file_bytes: bytes) -> str:
+    """Extract raw text from PDF bytes, cached on the file's fingerprint()"""
+    from utils.pdf_parser import PDFParser
+    return PDFParser().extract_text_from_pdf(_file_bytes)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def render_first_page(file_key: str, _file_bytes: bytes) -> bytes:
+    """Render page 1 of the PDF to PNG in-process with PyMuPDF"""
+    import fitz  # PyMuPDF
+    with fitz.open(stream=_file_bytes, filetype="pdf") as pdf_document:
+        return pdf_document.load_page(0).get_pixmap(dpi=100).tobytes("png")
+
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_processor(api_key: str):
+    """Gemini client shared across reruns and sessions"""
+    from utils.gemini_processor import GeminiProcessor
+    return GeminiProcessor(api_key=api_key)
+
+
+class ExtractionFailed(Exception):
+    """Gemini returned no usable diary; carries the raw response text
+
+    Raised rather than returned so st.cache_data doesn't keep the failure.
+    """
+
+    def __init__(self, response_text):
+        super().__init__("Gemini did not return structured data")
+        self.response_text = response_text
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def run_gemini(raw_text: str, api_key: str):
+    """Run Gemini extraction, cached on the raw text
+
+    Returns a (diary JSON bytes, raw response text) tuple. Raises
+    ExtractionFailed, which is not cached, if the extraction failed or
+    came back empty.
+    """
+    processor = get_gemini_processor(api_key)
+    processed = processor.extract_site_report_data(raw_text)
+    response_text = getattr(processor, "last_response_text", None)
+    if processed is None or not processed.has_content():
+        raise ExtractionFailed(response_text)
+    return processed.to_json_bytes(), response_text
+
+
+def run_gemini_many(raw_texts, api_key: str):
+    """Run Gemini extraction on several reports at once
+
+    Returns a (diary JSON bytes or None, raw response text) tuple per
+    report, in order. Not cached as a batch; single reports go through
+    run_gemini().
+    """
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    processor = get_gemini_processor(api_key)
+    # Workers share this script run's context, so their st.warning/st.error render
+    results = processor.extract_many(list(raw_texts), initializer=add_script_run_ctx,
+                                     initargs=(None, get_script_run_ctx()))
+    return [(data.to_json_bytes() if data is not None and data.has_content() else None, response_text)
+            for data, response_text in results]
+
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_generator():
+    """PDF generator shared across reruns, so the logo assets are read once per process"""
+    from utils.enhanced_pdf_generator import EnhancedPDFGenerator
+    return EnhancedPDFGenerator()
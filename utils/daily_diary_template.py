@@ -3,11 +3,45 @@ This module contains the layout and styling configurations for the PDF template
 """
 
 from reportlab.lib.utils import ImageReader
+from functools import lru_cache, cached_property
 import os
 from typing import List, Dict, Any, Tuple
 from reportlab.lib.units import mm, inch
 from reportlab.lib import colors
 
+# Logos live in <repo>/assets, independent of the working directory
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+
+# (width, height) of the box each logo is drawn into in the header
+LOGO_BOXES = {
+    'nod': (55*mm, 25*mm),
+    'ms': (40*mm, 15*mm)
+}
+
+# Logos larger than their box at this resolution are downsampled before embedding
+LOGO_DPI = 300
+
+
+@lru_cache(maxsize=None)
+def _load_image(path, box=None):
+    """Resolve and open an image once per process; None if missing or unreadable
+    
+    With a (width, height) box in points the image is shrunk to fit it at
+    LOGO_DPI, so every PDF embeds (and encodes) fewer pixels.
+    """
+    try:
+        if not os.path.exists(path):
+            return None
+        if box is None:
+            return ImageReader(path)
+        from PIL import Image
+        image = Image.open(path)
+        image.thumbnail(tuple(round(side / inch * LOGO_DPI) for side in box), Image.LANCZOS)
+        return ImageReader(image)
+    except Exception:
+        return None
+
+
 class DailyDiaryTemplate:
     """Template configuration for Daily Diary PDF"""
     
@@ -16,23 +50,31 @@ class DailyDiaryTemplate:
         self.setup_colors()
         self.setup_fonts()
         self.setup_sections()
-        self.load_logos()  # Load logos during initialization
     
-    def load_logos(self):
-        """Load logos directly from assets folder"""
-        self.logos = {
-            'nod': self._load_logo('assets/logo_nod.png'),
-            'ms': self._load_logo('assets/logo_ms.png')
+    @cached_property
+    def logos(self):
+        """Logos from the assets folder, sized for their LOGO_BOXES
+        
+        Loaded on first use rather than at import, so importing the PDF
+        generator doesn't read and resample the image files.
+        """
+        return {
+            'nod': self._load_logo(os.path.join(ASSETS_DIR, 'logo_nod.png'), LOGO_BOXES['nod']),
+            'ms': self._load_logo(os.path.join(ASSETS_DIR, 'logo_ms.png'), LOGO_BOXES['ms'])
         }
     
-    def _load_logo(self, path):
-        """Load logo image with fallback"""
-        try:
-            if os.path.exists(path):
-                return ImageReader(path)
-            return None
-        except:
-            return None
+    def load_logos(self):
+        """Reload logos from the assets folder, e.g. after the files changed
+        
+        Clears the per-process image cache too, so the files are read again.
+        """
+        _load_image.cache_clear()
+        self.__dict__.pop('logos', None)
+        return self.logos
+    
+    def _load_logo(self, path, box=None):
+        """Load logo image with fallback, cached per path and box"""
+        return _load_image(path, box)
     
     def setup_dimensions(self):
         """Set up page dimensions and margins"""
@@ -1,9 +1,50 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from calendar import monthrange
+import json
+import re
 
-@dataclass
-class ActivityData:
+try:
+    import orjson  # optional, much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+# Sentinel for fields not yet set during __init__
+_UNSET = object()
+
+# DD-MM-YYYY; like strptime("%d-%m-%Y"), day and month may be a single digit
+_DATE_RE = re.compile(r'(\d{1,2})-(\d{1,2})-(\d{4})', re.ASCII)
+
+
+def _is_valid_date(value: str) -> bool:
+    """Same verdict as datetime.strptime(value, "%d-%m-%Y"), without the exception cost"""
+    match = _DATE_RE.fullmatch(value)
+    if match is None:
+        return False
+    day, month, year = map(int, match.groups())
+    return year >= 1 and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]
+
+class _Row:
+    """Dict conversion shared by the table row dataclasses
+    
+    Rows arrive as dicts from Gemini JSON and the data editor; DailyDiaryData
+    normalizes them to these classes once, in from_dict(). Rows are frozen:
+    an edit replaces the whole row list (see DailyDiaryData.to_json_bytes()).
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Create a row from a dictionary; missing keys become None"""
+        return cls(*map(data.get, cls._FIELD_NAMES))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert row to dictionary"""
+        return dict(zip(self._FIELD_NAMES, self._get_fields(self)))
+
+@dataclass(slots=True, frozen=True)
+class ActivityData(_Row):
     """Data class for activity information"""
     sn: int
     description: str
@@ -11,8 +52,8 @@ class ActivityData:
     quantity: Optional[str] = None
     unit: Optional[str] = None
 
-@dataclass
-class EquipmentData:
+@dataclass(slots=True, frozen=True)
+class EquipmentData(_Row):
     """Data class for equipment information"""
     sn: int
     equipment: str
@@ -22,8 +63,8 @@ class EquipmentData:
     status: Optional[str] = None
     remarks: Optional[str] = None
 
-@dataclass
-class PersonnelData:
+@dataclass(slots=True, frozen=True)
+class PersonnelData(_Row):
     """Data class for personnel information"""
     sn: int
     personnel: str
@@ -31,23 +72,23 @@ class PersonnelData:
     hours: Optional[str] = None
     role: Optional[str] = None
 
-@dataclass
-class MaterialData:
+@dataclass(slots=True, frozen=True)
+class MaterialData(_Row):
     """Data class for material information"""
     type: str
     unit: str
     quantity: str
     location: Optional[str] = None
 
-@dataclass
-class UnsafeActData:
+@dataclass(slots=True, frozen=True)
+class UnsafeActData(_Row):
     """Data class for unsafe acts/conditions"""
     sn: int
     description: str
     severity: Optional[str] = None
     action_taken: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class DailyDiaryData:
     """Main data class for Daily Diary information"""
     
@@ -67,13 +108,13 @@ class DailyDiaryData:
     weather: str = "Sunny/Dry"
     
     # Work Activities
-    activities: List[Dict[str, Any]] = field(default_factory=list)
-    equipment: List[Dict[str, Any]] = field(default_factory=list)
-    personnel: List[Dict[str, Any]] = field(default_factory=list)
-    materials: List[Dict[str, Any]] = field(default_factory=list)
+    activities: List[ActivityData] = field(default_factory=list)
+    equipment: List[EquipmentData] = field(default_factory=list)
+    personnel: List[PersonnelData] = field(default_factory=list)
+    materials: List[MaterialData] = field(default_factory=list)
     
     # Safety Information
-    unsafe_acts: List[Dict[str, Any]] = field(default_factory=list)
+    unsafe_acts: List[UnsafeActData] = field(default_factory=list)
     near_miss: str = ""
     obstruction: str = ""
     engineers_note: str = ""
@@ -88,65 +129,72 @@ class DailyDiaryData:
     page_number: str = ""
     revision: str = ""
     
+    # Cached results of to_json_bytes() and validate()
+    _json_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _validation_cache: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        """Set a field and drop the cached results if its value changed
+        
+        The review form reassigns every field on each rerun, so an unchanged
+        value keeps the caches.
+        """
+        changed = not name.endswith('_cache') and getattr(self, name, _UNSET) != value
+        object.__setattr__(self, name, value)
+        if changed:
+            object.__setattr__(self, '_json_cache', None)
+            object.__setattr__(self, '_validation_cache', None)
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert data class to dictionary"""
-        return {
-            'project': self.project,
-            'employer': self.employer,
-            'consultant': self.consultant,
-            'contractor': self.contractor,
-            'date': self.date,
-            'time_morning': self.time_morning,
-            'time_afternoon': self.time_afternoon,
-            'location': self.location,
-            'weather': self.weather,
-            'activities': self.activities,
-            'equipment': self.equipment,
-            'personnel': self.personnel,
-            'materials': self.materials,
-            'unsafe_acts': self.unsafe_acts,
-            'near_miss': self.near_miss,
-            'obstruction': self.obstruction,
-            'engineers_note': self.engineers_note,
-            'prepared_by': self.prepared_by,
-            'checked_by': self.checked_by,
-            'approved_by': self.approved_by,
-            'document_number': self.document_number,
-            'page_number': self.page_number,
-            'revision': self.revision
-        }
+        """Convert data class to dictionary, rows included"""
+        data = dict(zip(_DIARY_FIELDS, _get_diary_fields(self)))
+        for name in ROW_TYPES:
+            data[name] = [row.to_dict() for row in data[name]]
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DailyDiaryData':
-        """Create data class from dictionary"""
-        return cls(
-            project=data.get('project', ''),
-            employer=data.get('employer', ''),
-            consultant=data.get('consultant', ''),
-            contractor=data.get('contractor', ''),
-            date=data.get('date', ''),
-            time_morning=data.get('time_morning', False),
-            time_afternoon=data.get('time_afternoon', False),
-            location=data.get('location', ''),
-            weather=data.get('weather', 'Sunny/Dry'),
-            activities=data.get('activities', []),
-            equipment=data.get('equipment', []),
-            personnel=data.get('personnel', []),
-            materials=data.get('materials', []),
-            unsafe_acts=data.get('unsafe_acts', []),
-            near_miss=data.get('near_miss', ''),
-            obstruction=data.get('obstruction', ''),
-            engineers_note=data.get('engineers_note', ''),
-            prepared_by=data.get('prepared_by', ''),
-            checked_by=data.get('checked_by', ''),
-            approved_by=data.get('approved_by', ''),
-            document_number=data.get('document_number', ''),
-            page_number=data.get('page_number', ''),
-            revision=data.get('revision', '')
-        )
+        """Create data class from dictionary; missing or null keys take the field defaults
+        
+        Row dicts are converted to their row dataclasses (see ROW_TYPES).
+        """
+        kwargs = {name: data[name] for name in _DIARY_FIELDS if data.get(name) is not None}
+        for name, row_type in ROW_TYPES.items():
+            if name in kwargs:
+                kwargs[name] = rows_from_dicts(row_type, kwargs[name])
+        return cls(**kwargs)
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to UTF-8 JSON, cached until a field changes
+        
+        In-place changes to the row lists (e.g. append) are not tracked;
+        assign a new list instead.
+        """
+        if self._json_cache is None:
+            data = self.to_dict()
+            if orjson is not None:
+                encoded = orjson.dumps(data, default=str)
+            else:
+                encoded = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+            self._json_cache = encoded
+        return self._json_cache
+    
+    @classmethod
+    def from_json(cls, data: bytes) -> 'DailyDiaryData':
+        """Create data class from JSON produced by to_json_bytes()"""
+        return cls.from_dict(orjson.loads(data) if orjson is not None else json.loads(data))
     
     def validate(self) -> List[str]:
-        """Validate the data and return list of validation errors"""
+        """Validate the data and return list of validation errors
+        
+        The result is cached until a field changes (see to_json_bytes()
+        for the in-place caveat).
+        """
+        if self._validation_cache is None:
+            self._validation_cache = self._validate()
+        return list(self._validation_cache)
+    
+    def _validate(self) -> List[str]:
         errors = []
         
         # Required fields validation
@@ -157,20 +205,26 @@ class DailyDiaryData:
             errors.append("Date is required")
         
         # Date format validation
-        if self.date:
-            try:
-                # Try to parse the date to validate format
-                datetime.strptime(self.date, "%d-%m-%Y")
-            except ValueError:
-                errors.append("Date must be in DD-MM-YYYY format")
+        if self.date and not _is_valid_date(self.date):
+            errors.append("Date must be in DD-MM-YYYY format")
         
-        # Activities validation
-        for i, activity in enumerate(self.activities):
-            if not activity.get('description', '').strip():
-                errors.append(f"Activity {i+1} description is required")
+        # Activities validation; blank editor cells come back as None
+        append = errors.append
+        for i, activity in enumerate(self.activities, 1):
+            description = activity.description
+            if not description or description.isspace():
+                append(f"Activity {i} description is required")
         
         return errors
     
+    def has_content(self) -> bool:
+        """True if anything was extracted: a project name or any table row
+        
+        Fields that always carry a value (weather, the time flags) don't count.
+        """
+        return bool(self.project.strip() or self.activities or self.equipment
+                    or self.personnel or self.materials or self.unsafe_acts)
+    
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics of the data"""
         return {
@@ -184,7 +238,7 @@ class DailyDiaryData:
             'validation_errors': self.validate()
         }
 
-@dataclass
+@dataclass(slots=True)
 class SiteReportData:
     """Data class for raw site report information"""
     
@@ -219,20 +273,29 @@ class SiteReportData:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'date': self.date,
-            'location': self.location,
-            'station_from': self.station_from,
-            'station_to': self.station_to,
-            'mho_from': self.mho_from,
-            'mho_to': self.mho_to,
-            'site_location': self.site_location,
-            'prepared_by': self.prepared_by,
-            'activities': self.activities,
-            'equipment_used': self.equipment_used,
-            'personnel': self.personnel,
-            'materials': self.materials,
-            'raw_text': self.raw_text,
-            'processed_date': self.processed_date,
-            'source_file': self.source_file
-        }
\ No newline at end of file
+        return dict(zip(_SITE_REPORT_FIELDS, _get_site_report_fields(self)))
+
+
+# Row dataclass for each list field of DailyDiaryData
+ROW_TYPES = {
+    'activities': ActivityData,
+    'equipment': EquipmentData,
+    'personnel': PersonnelData,
+    'materials': MaterialData,
+    'unsafe_acts': UnsafeActData
+}
+
+
+def rows_from_dicts(row_type, rows) -> list:
+    """Normalize a list of row dicts (rows already of row_type pass through)"""
+    return [row if isinstance(row, row_type) else row_type.from_dict(row) for row in rows or ()]
+
+
+# Field names and C-level getters, captured once at import for to_dict/from_dict
+for _row_type in ROW_TYPES.values():
+    _row_type._FIELD_NAMES = tuple(f.name for f in fields(_row_type))
+    _row_type._get_fields = staticmethod(attrgetter(*_row_type._FIELD_NAMES))
+_DIARY_FIELDS = tuple(f.name for f in fields(DailyDiaryData) if f.init)
+_get_diary_fields = attrgetter(*_DIARY_FIELDS)
+_SITE_REPORT_FIELDS = tuple(f.name for f in fields(SiteReportData))
+_get_site_report_fields = attrgetter(*_SITE_REPORT_FIELDS)
@@ -1,65 +1,144 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
 from reportlab.lib.units import mm
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.pdfgen import canvas
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen.pathobject import PDFPathObject
 import io
-import os
-from typing import List, Dict, Optional
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, BinaryIO
 from utils.data_models import DailyDiaryData
-from PIL import Image
-from .daily_diary_template import DailyDiaryTemplate
+from .daily_diary_template import daily_diary_template, LOGO_BOXES
+from .text_layout import wrap_lines
+
+try:
+    import _rl_accel  # optional, ReportLab's C speedups (string widths, PDF escaping, ASCII85)
+except ImportError:
+    _rl_accel = None
+
+if _rl_accel is None:
+    logging.getLogger(__name__).warning(
+        "ReportLab C accelerator not installed (pip install rl_accel); using the slower pure-Python fallbacks")
+
+# Layout geometry in points, computed once at import rather than on every draw call
+LEFT_X = 10*mm                      # outer border
+RIGHT_X = 200*mm
+CONTENT_WIDTH = RIGHT_X - LEFT_X
+TEXT_X = 12*mm                      # text inset from the outer border
+CELL_PAD = TEXT_X - LEFT_X          # the same inset inside any column
+SECTION_TITLE_DROP = 3*mm           # section title baseline below the section top
+TABLE_HEADER_DROP = 6*mm            # table header rule below the section top
+HEADER_TEXT_RAISE = 1*mm            # column labels above the header rule
+
+# Section heights, top to bottom
+HEADER_HEIGHT = 22*mm
+TITLE_HEIGHT = 10*mm
+PROJECT_HEIGHT = 20*mm
+DATE_WEATHER_HEIGHT = 8*mm
+ACTIVITIES_HEIGHT = 40*mm
+EQUIPMENT_HEIGHT = 22*mm
+PERSONNEL_HEIGHT = 70*mm
+UNSAFE_ACTS_HEIGHT = 18*mm
+NOTE_HEIGHT = 12*mm                 # near miss and obstruction boxes
+ENGINEERS_NOTE_HEIGHT = 20*mm
+SIGNATURES_HEIGHT = 30*mm
+
+# Single-sided tables (activities, unsafe acts): sn column, then a description
+SN_DIVIDER_X = 20*mm
+DESCRIPTION_X = 22*mm
+DESCRIPTION_WIDTH = 175*mm
+ACTIVITY_ROW_HEIGHT = 6*mm
+UNSAFE_ACT_ROW_HEIGHT = 5.5*mm
+UNSAFE_ACTS_HEADER_DROP = 7*mm
+ACTIVITY_ROWS = 5
+UNSAFE_ACT_ROWS = 2
+
+# Two-sided tables (equipment, personnel): column dividers and the
+# (sn, name, no) text x positions of each half
+SPLIT_DIVIDERS_X = (20*mm, 45*mm, 70*mm, 105*mm, 130*mm, 155*mm)
+SPLIT_LEFT_CELLS_X = (12*mm, 22*mm, 72*mm)
+SPLIT_RIGHT_CELLS_X = (107*mm, 132*mm, 157*mm)
+SPLIT_NAME_WIDTH = 45*mm
+SPLIT_TEXT_RAISE = 0.5*mm           # row text above the row's bottom rule
+EQUIPMENT_ROW_HEIGHT = 3.2*mm
+PERSONNEL_ROW_HEIGHT = 4*mm
+EQUIPMENT_ROWS = 5                  # rows per half
+PERSONNEL_ROWS = 14
+
+# Row text baselines below each table's header rule, one per row
+ACTIVITY_TEXT_DROPS = tuple((i + 1) * ACTIVITY_ROW_HEIGHT - 1*mm for i in range(ACTIVITY_ROWS))
+UNSAFE_ACT_TEXT_DROPS = tuple((i + 1) * UNSAFE_ACT_ROW_HEIGHT - 2*mm for i in range(UNSAFE_ACT_ROWS))
+EQUIPMENT_TEXT_DROPS = tuple((i + 1) * EQUIPMENT_ROW_HEIGHT - SPLIT_TEXT_RAISE for i in range(EQUIPMENT_ROWS))
+PERSONNEL_TEXT_DROPS = tuple((i + 1) * PERSONNEL_ROW_HEIGHT - SPLIT_TEXT_RAISE for i in range(PERSONNEL_ROWS))
+
+# Project section: four equal columns
+PROJECT_COL_WIDTH = CONTENT_WIDTH / 4
+PROJECT_COLS_X = tuple(LEFT_X + i * PROJECT_COL_WIDTH for i in range(4))
+PROJECT_TEXT_WIDTH = PROJECT_COL_WIDTH - 4*mm
+
+# Date row text baseline above the section bottom
+DATE_TEXT_RAISE = 3*mm
+
+# Morning/afternoon checkboxes in the date row, sitting on the text baseline
+CHECKBOXES_X = (145*mm, 180*mm)
+CHECKBOX_SIZE = 2.5*mm
+CHECK_MARK = ((0.2, 0.5), (0.4, 0.2), (0.8, 0.85))  # tick vertices as fractions of the box
+
+# Free-text boxes below the tables: text width and first baseline above each box's bottom
+NOTE_TEXT_WIDTH = 185*mm
+NOTE_TEXT_RAISE = 4*mm              # near miss and obstruction
+ENGINEERS_NOTE_TEXT_RAISE = 10*mm
+
+# The free-text boxes in page order: (field, title, box height, title raise, text raise)
+NOTE_SECTIONS = (
+    ('near_miss', "7. Near Miss/Accidents/Incidents:", NOTE_HEIGHT, 8*mm, NOTE_TEXT_RAISE),
+    ('obstruction', "8. Obstruction/Action Plans:", NOTE_HEIGHT, 8*mm, NOTE_TEXT_RAISE),
+    ('engineers_note', "9. Engineer's Note:", ENGINEERS_NOTE_HEIGHT, 16*mm, ENGINEERS_NOTE_TEXT_RAISE),
+)
+
+# Signatures: three equal columns
+SIGNATURE_COL_WIDTH = CONTENT_WIDTH / 3
+SIGNATURE_COLS_X = tuple(LEFT_X + i * SIGNATURE_COL_WIDTH for i in range(3))
+SIGNATURE_NAME_DROP = 15*mm         # "Name:" baseline below the section top
+
+# MS Consultancy logo position in the header's right column
+MS_LOGO_X = 162*mm
+MS_LOGO_RAISE = 3*mm
+
+
+class PDFGenerationError(RuntimeError):
+    """Raised by EnhancedPDFGenerator.generate(); the original error is its __cause__"""
+
 
 class EnhancedPDFGenerator:
     """Complete Daily Diary PDF Generator with fixed text overflow issues"""
 
+    # Borders, rules and fixed labels, built once per process (see _page_skeleton)
+    _SKELETON = None
+
     def __init__(self):
         self.page_width, self.page_height = A4
         self.margin = 10 * mm
-        self.template = DailyDiaryTemplate()  # Template with logos
-        self.setup_styles()
+        self.template = daily_diary_template  # Shared template, logos loaded once
     
-    def setup_styles(self):
-        """Setup all text styles for the PDF"""
-        self.styles = getSampleStyleSheet()
-
-        self.header_style = ParagraphStyle(
-            'HeaderStyle',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            fontName='Helvetica-Bold'
-        )
-
-        self.normal_style = ParagraphStyle(
-            'NormalStyle',
-            parent=self.styles['Normal'],
-            fontSize=8,
-            fontName='Helvetica'
-        )
-
-        self.small_style = ParagraphStyle(
-            'SmallStyle',
-            parent=self.styles['Normal'],
-            fontSize=7,
-            fontName='Helvetica'
-        )
-
-    def generate(self, data: DailyDiaryData) -> bytes:
-        """Main generate method that uses template logos"""
-        return self.generate_daily_diary_pdf(data)
-
-    def generate_daily_diary_pdf(self, data: DailyDiaryData) -> bytes:
+    def generate(self, data: DailyDiaryData, out: Optional[BinaryIO] = None) -> Optional[bytes]:
+        """Main generate method that uses template logos
+        
+        With `out` the PDF is written to that binary stream and None is
+        returned; otherwise the PDF is returned as bytes.
+        """
+        return self.generate_daily_diary_pdf(data, out)
+
+    def generate_daily_diary_pdf(self, data: DailyDiaryData, out: Optional[BinaryIO] = None) -> Optional[bytes]:
         """Generate complete Daily Diary PDF with all sections"""
+        buffer = out if out is not None else io.BytesIO()
         try:
-            buffer = io.BytesIO()
-            c = canvas.Canvas(buffer, pagesize=A4)
+            # Explicit, so the output stays compressed whatever the local reportlab settings say
+            c = canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
 
             current_y = self.page_height - self.margin
+            self._draw_skeleton(c)
             
-            # Draw all sections in order
+            # Draw the data of each section in order
             current_y = self._draw_header_section(c, data, current_y)
             current_y = self._draw_title_section(c, data, current_y)
             current_y = self._draw_project_section(c, data, current_y)
@@ -72,390 +151,371 @@ class EnhancedPDFGenerator:
             current_y = self._draw_signatures_section(c, data, current_y)
 
             c.save()
-            pdf_bytes = buffer.getvalue()
-            buffer.close()
-            return pdf_bytes
+            if out is not None:
+                return None
+            return buffer.getvalue()
         except Exception as e:
-            raise Exception(f"Error generating PDF: {str(e)}")
+            raise PDFGenerationError(f"Error generating PDF: {e}") from e
 
-    def _draw_header_section(self, c, data, start_y):
-        """Complete header section with logos"""
-        section_height = 22*mm
-        section_bottom = start_y - section_height
+    def _page_skeleton(self):
+        """Static part of the page, built once per process
+        
+        Returns (path, labels): a PDFPathObject with every border and rule,
+        and (font_name, font_size, items) runs for _draw_text_items() with
+        every fixed label. Sections are stacked as in generate_daily_diary_pdf().
+        """
+        cls = type(self)
+        if cls._SKELETON is not None:
+            return cls._SKELETON
+
+        path = PDFPathObject()
+        labels = {}
+
+        def box(top, height):
+            path.rect(LEFT_X, top - height, CONTENT_WIDTH, height)
+            return top - height
+
+        def rule(x1, y1, x2, y2):
+            path.moveTo(x1, y1)
+            path.lineTo(x2, y2)
+
+        def label(font_name, font_size, x, y, text):
+            labels.setdefault((font_name, font_size), []).append((x, y, text))
+
+        # Header
+        top = self.page_height - self.margin
+        bottom = box(top, HEADER_HEIGHT)
+        for x in (85*mm, 160*mm):
+            rule(x, bottom, x, top)
+        label("Helvetica", 7, 87*mm, bottom + 17*mm, "Company Name")
+        for y, text in ((14, "Unit E4, Nutgrove Office Park,"), (11.5, "Nutgrove Avenue, Dublin 14"),
+                        (9, "T +353 1 296 9000"), (6.5, "F +353 1 296 9001"), (4, "E dublin@nodwyer.com")):
+            label("Helvetica", 6, 87*mm, bottom + y*mm, text)
+        label("Helvetica", 7, 162*mm, bottom + 17*mm, "in Jv with")
+
+        # Title
+        top, bottom = bottom, box(bottom, TITLE_HEIGHT)
+        for x in (80*mm, 135*mm):
+            rule(x, bottom, x, top)
+        for x, text in ((TEXT_X, "Title: Daily Diary"), (82*mm, "Document No:"), (137*mm, "Page No.   of")):
+            label("Helvetica", 8, x, bottom + 4*mm, text)
+
+        # Project; the column texts are fixed too
+        top, bottom = bottom, box(bottom, PROJECT_HEIGHT)
+        for x in PROJECT_COLS_X[1:]:
+            rule(x, bottom, x, top)
+        texts = ("Construction of Trunk Lines for Kotebe and Kitime Sub-Catchment of Eastern Sewer Line Project",
+                 "AAWSA-WISIDD, THE WORLD BANK",
+                 "NICHOLAS O'DWYER LTD. In Jv. with MS CONSULTANCY",
+                 "ASER CONSTRUCTION PLC")
+        for col_x, heading, text, max_lines in zip(PROJECT_COLS_X, ("PROJECT", "EMPLOYER", "CONSULTANT", "CONTRACTOR"),
+                                                  texts, (2, 1, 2, 1)):
+            label("Helvetica-Bold", 8, col_x + CELL_PAD, top - SECTION_TITLE_DROP, heading)
+            for item in self._wrapped_items(None, text, col_x + CELL_PAD, top - 8*mm, PROJECT_TEXT_WIDTH, 7,
+                                            max_lines=max_lines):
+                label("Helvetica", 7, *item)
+
+        # Date and weather
+        top, bottom = bottom, box(bottom, DATE_WEATHER_HEIGHT)
+        for x in (50*mm, 130*mm, 160*mm):
+            rule(x, bottom, x, top)
+        for x, text in ((52*mm, "Weather condition: "), (132*mm, "Morning"), (162*mm, "Afternoon")):
+            label("Helvetica", 7, x, bottom + DATE_TEXT_RAISE, text)
+        for x in CHECKBOXES_X:
+            path.rect(x, bottom + DATE_TEXT_RAISE, CHECKBOX_SIZE, CHECKBOX_SIZE)
+
+        # Activities
+        top, bottom = bottom, box(bottom, ACTIVITIES_HEIGHT)
+        label("Helvetica", 7, TEXT_X, top - SECTION_TITLE_DROP, "3. Major Activities on progress, Chain age and Location")
+        header_y = top - TABLE_HEADER_DROP
+        rule(LEFT_X, header_y, RIGHT_X, header_y)
+        rule(SN_DIVIDER_X, bottom, SN_DIVIDER_X, header_y)
+        label("Helvetica-Bold", 6, TEXT_X, header_y + HEADER_TEXT_RAISE, "sn")
+        label("Helvetica-Bold", 6, DESCRIPTION_X, header_y + HEADER_TEXT_RAISE, "Description/Topic - Contractor's work")
+        for i in range(ACTIVITY_ROWS):
+            row_y = header_y - (i + 1) * ACTIVITY_ROW_HEIGHT
+            rule(LEFT_X, row_y, RIGHT_X, row_y)
+
+        # Equipment and personnel
+        for height, title, name_label, no_label, row_height, rows in (
+                (EQUIPMENT_HEIGHT, "4. Contractor's Equipment (dumper truck, excavator, water pump etc.)",
+                 "Equipment", "NO", EQUIPMENT_ROW_HEIGHT, EQUIPMENT_ROWS),
+                (PERSONNEL_HEIGHT, "5. Contractor's Personnel (Foreman, laborer, driver etc.)",
+                 "Personnel", "No.", PERSONNEL_ROW_HEIGHT, PERSONNEL_ROWS)):
+            top, bottom = bottom, box(bottom, height)
+            label("Helvetica", 7, TEXT_X, top - SECTION_TITLE_DROP, title)
+            header_y = top - TABLE_HEADER_DROP
+            rule(LEFT_X, header_y, RIGHT_X, header_y)
+            for x in SPLIT_DIVIDERS_X:
+                rule(x, bottom, x, header_y)
+            for cells_x in (SPLIT_LEFT_CELLS_X, SPLIT_RIGHT_CELLS_X):
+                for x, text in zip(cells_x, ("sn", name_label, no_label)):
+                    label("Helvetica-Bold", 6, x, header_y + HEADER_TEXT_RAISE, text)
+            for i in range(rows):
+                row_y = header_y - (i + 1) * row_height
+                rule(LEFT_X, row_y, RIGHT_X, row_y)
+
+        # Unsafe acts
+        top, bottom = bottom, box(bottom, UNSAFE_ACTS_HEIGHT)
+        label("Helvetica", 8, TEXT_X, top - SECTION_TITLE_DROP, "6. Unsafe Acts / Conditions Observed")
+        header_y = top - UNSAFE_ACTS_HEADER_DROP
+        rule(LEFT_X, header_y, RIGHT_X, header_y)
+        rule(SN_DIVIDER_X, bottom, SN_DIVIDER_X, header_y)
+        label("Helvetica-Bold", 7, TEXT_X, header_y + HEADER_TEXT_RAISE, "sn")
+        label("Helvetica-Bold", 7, DESCRIPTION_X, header_y + HEADER_TEXT_RAISE, "Description of Unsafe Acts")
+        for i in range(UNSAFE_ACT_ROWS):
+            row_y = header_y - (i + 1) * UNSAFE_ACT_ROW_HEIGHT
+            rule(LEFT_X, row_y, RIGHT_X, row_y)
+
+        # Near miss, obstruction and engineer's note
+        for _, title, height, title_raise, _ in NOTE_SECTIONS:
+            bottom = box(bottom, height)
+            label("Helvetica", 8, TEXT_X, bottom + title_raise, title)
+
+        # Signatures
+        top, bottom = bottom, bottom - SIGNATURES_HEIGHT
+        for x in SIGNATURE_COLS_X[1:]:
+            rule(x, bottom, x, top)
+        roles = ("Construction Staff", "Consultant Supervision Staff", "Consultant Supervision Staff")
+        for col_x, heading, role in zip(SIGNATURE_COLS_X, ("Prepared by", "Checked by", "Approved by"), roles):
+            text_x = col_x + CELL_PAD
+            label("Helvetica-Bold", 8, text_x, top - 5*mm, heading)
+            label("Helvetica", 7, text_x, top - 9*mm, role)
+            label("Helvetica", 7, text_x, top - 20*mm, "Sign: ________________")
+
+        # Join the path's operators into one preformatted string; drawPath()
+        # would otherwise re-join its hundred-odd operators for every PDF
+        path = PDFPathObject([path.getCode()])
+        cls._SKELETON = (path, tuple((font_name, font_size, tuple(items))
+                                     for (font_name, font_size), items in labels.items()))
+        return cls._SKELETON
+
+    def _draw_skeleton(self, c):
+        """Stroke every border and rule as one path, then the fixed labels"""
+        path, labels = self._page_skeleton()
+        c.drawPath(path, stroke=1, fill=0)
+        for font_name, font_size, items in labels:
+            self._draw_text_items(c, items, font_name, font_size)
 
-        # Main border and dividers
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        c.line(85*mm, section_bottom, 85*mm, start_y)
-        c.line(160*mm, section_bottom, 160*mm, start_y)
+    def _draw_header_section(self, c, data, start_y):
+        """Header logos, or their text fallbacks"""
+        section_bottom = start_y - HEADER_HEIGHT
 
         # Nicholas O'Dwyer logo
-        if self.template.logos['nod']:
-            c.drawImage(self.template.logos['nod'], 12*mm, section_bottom + 0*mm, 
-                      width=55*mm, height=25*mm, preserveAspectRatio=True)
-        else:
-            c.setFont("Helvetica-Bold", 9)
-            c.drawString(12*mm, section_bottom + 15*mm, "NICHOLAS")
-            c.drawString(12*mm, section_bottom + 10*mm, "O'DWYER")
-
-        # Company details
-        c.setFont("Helvetica", 7)
-        c.drawString(87*mm, section_bottom + 17*mm, "Company Name")
-        c.setFont("Helvetica", 6)
-        c.drawString(87*mm, section_bottom + 14*mm, "Unit E4, Nutgrove Office Park,")
-        c.drawString(87*mm, section_bottom + 11.5*mm, "Nutgrove Avenue, Dublin 14")
-        c.drawString(87*mm, section_bottom + 9*mm, "T +353 1 296 9000")
-        c.drawString(87*mm, section_bottom + 6.5*mm, "F +353 1 296 9001")
-        c.drawString(87*mm, section_bottom + 4*mm, "E dublin@nodwyer.com")
+        if not self._draw_logo(c, self.template.logos['nod'], TEXT_X, section_bottom, *LOGO_BOXES['nod']):
+            self._draw_text_items(c, [(TEXT_X, section_bottom + 15*mm, "NICHOLAS"),
+                                      (TEXT_X, section_bottom + 10*mm, "O'DWYER")], "Helvetica-Bold", 9)
 
         # MS Consultancy logo
-        c.setFont("Helvetica", 7)
-        c.drawString(162*mm, section_bottom + 17*mm, "in Jv with")
-        
-        if self.template.logos['ms']:
-            c.drawImage(self.template.logos['ms'], 162*mm, section_bottom + 3*mm,
-                      width=40*mm, height=15*mm, preserveAspectRatio=True)
-        else:
-            c.setFont("Helvetica-Bold", 8)
-            c.drawString(162*mm, section_bottom + 10*mm, "MS Consultancy")
+        if not self._draw_logo(c, self.template.logos['ms'], MS_LOGO_X, section_bottom + MS_LOGO_RAISE,
+                               *LOGO_BOXES['ms']):
+            self._draw_text_items(c, [(MS_LOGO_X, section_bottom + 10*mm, "MS Consultancy")], "Helvetica-Bold", 8)
 
         return section_bottom
 
-    def _draw_title_section(self, c, data, start_y):
-        """Complete title section"""
-        section_height = 10*mm
-        section_bottom = start_y - section_height
-
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        c.line(80*mm, section_bottom, 80*mm, start_y)
-        c.line(135*mm, section_bottom, 135*mm, start_y)
-
-        c.setFont("Helvetica", 8)
-        c.drawString(12*mm, section_bottom + 4*mm, "Title: Daily Diary")
-        c.drawString(82*mm, section_bottom + 4*mm, "Document No:")
-        c.drawString(137*mm, section_bottom + 4*mm, "Page No.   of")
+    def _draw_logo(self, c, logo, x, y, width, height):
+        """Draw a logo; False if it is missing or its image data can't be read"""
+        if not logo:
+            return False
+        try:
+            c.drawImage(logo, x, y, width=width, height=height, preserveAspectRatio=True)
+        except OSError:  # includes PIL.UnidentifiedImageError
+            return False
+        return True
 
-        return section_bottom
+    def _draw_title_section(self, c, data, start_y):
+        """Title section; all of it is in the page skeleton"""
+        return start_y - TITLE_HEIGHT
 
     def _draw_project_section(self, c, data, start_y):
-        """Complete project section with text wrapping"""
-        section_height = 20*mm  # Increased height
-        section_bottom = start_y - section_height
-        col_width = 190*mm / 4
-
-        # Draw borders
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        for i in range(1, 4):
-            c.line(10*mm + (i * col_width), section_bottom, 10*mm + (i * col_width), start_y)
-
-        # Headers
-        c.setFont("Helvetica-Bold", 8)
-        c.drawString(12*mm, start_y - 3*mm, "PROJECT")
-        c.drawString(12*mm + col_width, start_y - 3*mm, "EMPLOYER")
-        c.drawString(12*mm + (2*col_width), start_y - 3*mm, "CONSULTANT")
-        c.drawString(12*mm + (3*col_width), start_y - 3*mm, "CONTRACTOR")
-
-        # Project data with fixed text
-        project_text = "Construction of Trunk Lines for Kotebe and Kitime Sub-Catchment of Eastern Sewer Line Project"
-        employer_text = "AAWSA-WISIDD, THE WORLD BANK"
-        consultant_text = "NICHOLAS O'DWYER LTD. In Jv. with MS CONSULTANCY"
-        contractor_text = "ASER CONSTRUCTION PLC"
-
-        # Draw text with wrapping
-        self._draw_wrapped_text(c, project_text, 12*mm, start_y - 8*mm, col_width - 4*mm, 7, max_lines=2)
-        self._draw_wrapped_text(c, employer_text, 12*mm + col_width, start_y - 8*mm, col_width - 4*mm, 7, max_lines=1)
-        self._draw_wrapped_text(c, consultant_text, 12*mm + (2*col_width), start_y - 8*mm, col_width - 4*mm, 7, max_lines=2)
-        self._draw_wrapped_text(c, contractor_text, 12*mm + (3*col_width), start_y - 8*mm, col_width - 4*mm, 7, max_lines=1)
-
-        return section_bottom
+        """Project section; all of it is in the page skeleton"""
+        return start_y - PROJECT_HEIGHT
 
     def _draw_date_weather_section(self, c, data, start_y):
-        """Complete date and weather section"""
-        section_height = 8*mm
-        section_bottom = start_y - section_height
-
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        c.line(50*mm, section_bottom, 50*mm, start_y)
-        c.line(130*mm, section_bottom, 130*mm, start_y)
-        c.line(160*mm, section_bottom, 160*mm, start_y)
-
-        c.setFont("Helvetica", 7)
-        c.drawString(12*mm, section_bottom + 3*mm, f"1. Date: {self._safe_text(getattr(data, 'date', ''))}")
-        c.drawString(52*mm, section_bottom + 3*mm, "Weather condition: ")
-        c.drawString(132*mm, section_bottom + 3*mm, "Morning")
-        c.drawString(162*mm, section_bottom + 3*mm, "Afternoon")
-
-        # Checkboxes
-        morning_check = "☑" if getattr(data, 'time_morning', False) else "☐"
-        afternoon_check = "☑" if getattr(data, 'time_afternoon', False) else "☐"
-        c.drawString(145*mm, section_bottom + 3*mm, morning_check)
-        c.drawString(180*mm, section_bottom + 3*mm, afternoon_check)
+        """Date and the ticks of the morning/afternoon checkboxes"""
+        section_bottom = start_y - DATE_WEATHER_HEIGHT
+
+        text_y = section_bottom + DATE_TEXT_RAISE
+        self._draw_text_items(c, [(TEXT_X, text_y, f"1. Date: {data.date}")], "Helvetica", 7)
+
+        # The empty boxes are in the page skeleton; tick the checked ones.
+        # Helvetica has no ballot box glyphs, so these are drawn as paths.
+        ticked = [x for x, checked in zip(CHECKBOXES_X, (data.time_morning, data.time_afternoon)) if checked]
+        if ticked:
+            path = c.beginPath()
+            for x in ticked:
+                (x1, y1), *rest = [(x + fx * CHECKBOX_SIZE, text_y + fy * CHECKBOX_SIZE) for fx, fy in CHECK_MARK]
+                path.moveTo(x1, y1)
+                for x2, y2 in rest:
+                    path.lineTo(x2, y2)
+            c.drawPath(path, stroke=1, fill=0)
 
         return section_bottom
 
     def _draw_activities_section(self, c, data, start_y):
-        """Complete activities section with improved text handling"""
-        section_height = 40*mm  # Increased height
-        section_bottom = start_y - section_height
-        row_height = 6*mm  # Increased row height
-
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        c.setFont("Helvetica", 7)
-        c.drawString(12*mm, start_y - 3*mm, "3. Major Activities on progress, Chain age and Location")
-
-        header_y = start_y - 6*mm
-        c.line(10*mm, header_y, 200*mm, header_y)
-        c.line(20*mm, section_bottom, 20*mm, header_y)
-
-        # Headers
-        c.setFont("Helvetica-Bold", 6)
-        c.drawString(12*mm, header_y + 1*mm, "sn")
-        c.drawString(22*mm, header_y + 1*mm, "Description/Topic - Contractor's work")
-
-        activities = getattr(data, 'activities', []) or []
-        for i in range(5):
-            row_y = header_y - (i + 1) * row_height
-            c.line(10*mm, row_y, 200*mm, row_y)
-
-            if i < len(activities):
-                activity = activities[i]
-                c.setFont("Helvetica", 6)
-                c.drawString(12*mm, row_y + 1*mm, str(activity.get('sn', i + 1)))
-                self._draw_wrapped_text(c, self._safe_text(activity.get('description', '')), 
-                                     22*mm, row_y + 1*mm, 175*mm, 6, max_lines=2)
+        """Activity rows, with descriptions wrapped to two lines"""
+        header_y = start_y - TABLE_HEADER_DROP
 
-        return section_bottom
+        items = []
+        rows = self._row_texts(data.activities, ("description",), 0, ACTIVITY_ROWS)
+        for text_drop, (sn, description) in zip(ACTIVITY_TEXT_DROPS, rows):
+            text_y = header_y - text_drop
+            items.append((TEXT_X, text_y, sn))
+            items += self._wrapped_items(c, description, DESCRIPTION_X, text_y, DESCRIPTION_WIDTH, 6, max_lines=2)
+        self._draw_text_items(c, items, "Helvetica", 6)
 
-    def _draw_equipment_section(self, c, data, start_y):
-        """Complete equipment section"""
-        section_height = 22*mm
-        section_bottom = start_y - section_height
-
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        c.setFont("Helvetica", 7)
-        c.drawString(12*mm, start_y - 3*mm, "4. Contractor's Equipment (dumper truck, excavator, water pump etc.)")
-
-        header_y = start_y - 6*mm
-        c.line(10*mm, header_y, 200*mm, header_y)
-
-        col_positions = [20*mm, 45*mm, 70*mm, 105*mm, 130*mm, 155*mm]
-        for pos in col_positions:
-            c.line(pos, section_bottom, pos, header_y)
-
-        c.setFont("Helvetica-Bold", 6)
-        c.drawString(12*mm, header_y + 1*mm, "sn")
-        c.drawString(22*mm, header_y + 1*mm, "Equipment")
-        c.drawString(72*mm, header_y + 1*mm, "NO")
-        c.drawString(107*mm, header_y + 1*mm, "sn")
-        c.drawString(132*mm, header_y + 1*mm, "Equipment")
-        c.drawString(157*mm, header_y + 1*mm, "NO")
-
-        equipment = getattr(data, 'equipment', []) or []
-        row_height = 3.2*mm
-
-        for i in range(5):
-            row_y = header_y - (i + 1) * row_height
-            c.line(10*mm, row_y, 200*mm, row_y)
-
-            c.setFont("Helvetica", 6)
-
-            if i < len(equipment):
-                eq = equipment[i]
-                c.drawString(12*mm, row_y + 0.5*mm, str(eq.get('sn', i + 1)))
-                self._draw_wrapped_text(c, self._safe_text(eq.get('equipment', '')), 
-                                     22*mm, row_y + 0.5*mm, 45*mm, 6)
-                c.drawString(72*mm, row_y + 0.5*mm, self._safe_text(eq.get('no', '')))
-
-            right_idx = i + 5
-            if right_idx < len(equipment):
-                eq = equipment[right_idx]
-                c.drawString(107*mm, row_y + 0.5*mm, str(eq.get('sn', right_idx + 1)))
-                self._draw_wrapped_text(c, self._safe_text(eq.get('equipment', '')), 
-                                     132*mm, row_y + 0.5*mm, 45*mm, 6)
-                c.drawString(157*mm, row_y + 0.5*mm, self._safe_text(eq.get('no', '')))
+        return start_y - ACTIVITIES_HEIGHT
 
-        return section_bottom
+    def _draw_equipment_section(self, c, data, start_y):
+        """Equipment rows, filling the left half of the table first"""
+        self._draw_split_rows(c, data.equipment, ("equipment", "no"), start_y - TABLE_HEADER_DROP,
+                              EQUIPMENT_TEXT_DROPS)
+        return start_y - EQUIPMENT_HEIGHT
 
     def _draw_personnel_section(self, c, data, start_y):
-        """Complete personnel section with improved layout"""
-        section_height = 70*mm  # Increased height
-        section_bottom = start_y - section_height
-        row_height = 4*mm  # Adjusted row height
-
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        c.setFont("Helvetica", 7)
-        c.drawString(12*mm, start_y - 3*mm, "5. Contractor's Personnel (Foreman, laborer, driver etc.)")
-
-        header_y = start_y - 6*mm
-        c.line(10*mm, header_y, 200*mm, header_y)
-
-        col_positions = [20*mm, 45*mm, 70*mm, 105*mm, 130*mm, 155*mm]
-        for pos in col_positions:
-            c.line(pos, section_bottom, pos, header_y)
-
-        c.setFont("Helvetica-Bold", 6)
-        c.drawString(12*mm, header_y + 1*mm, "sn")
-        c.drawString(22*mm, header_y + 1*mm, "Personnel")
-        c.drawString(72*mm, header_y + 1*mm, "No.")
-        c.drawString(107*mm, header_y + 1*mm, "sn")
-        c.drawString(132*mm, header_y + 1*mm, "Personnel")
-        c.drawString(157*mm, header_y + 1*mm, "No.")
-
-        personnel = getattr(data, 'personnel', []) or []
-        for i in range(14):
-            row_y = header_y - (i + 1) * row_height
-            c.line(10*mm, row_y, 200*mm, row_y)
-
-            c.setFont("Helvetica", 6)
-
-            if i < len(personnel):
-                person = personnel[i]
-                c.drawString(12*mm, row_y + 0.5*mm, str(person.get('sn', i + 1)))
-                self._draw_wrapped_text(c, self._safe_text(person.get('personnel', '')), 
-                                     22*mm, row_y + 0.5*mm, 45*mm, 6)
-                c.drawString(72*mm, row_y + 0.5*mm, self._safe_text(person.get('no', '')))
-
-            right_idx = i + 14
-            if right_idx < len(personnel):
-                person = personnel[right_idx]
-                c.drawString(107*mm, row_y + 0.5*mm, str(person.get('sn', right_idx + 1)))
-                self._draw_wrapped_text(c, self._safe_text(person.get('personnel', '')), 
-                                     132*mm, row_y + 0.5*mm, 45*mm, 6)
-                c.drawString(157*mm, row_y + 0.5*mm, self._safe_text(person.get('no', '')))
+        """Personnel rows, filling the left half of the table first"""
+        self._draw_split_rows(c, data.personnel, ("personnel", "no"), start_y - TABLE_HEADER_DROP,
+                              PERSONNEL_TEXT_DROPS)
+        return start_y - PERSONNEL_HEIGHT
 
-        return section_bottom
+    def _draw_split_rows(self, c, rows, fields, header_y, text_drops):
+        """Draw (sn, name, no) rows of a two-sided table, left half first
+        
+        `text_drops` holds the row baselines of one half, so its length is the
+        number of rows per half.
+        """
+        rows_per_side = len(text_drops)
+        items = []
+        # Bound once; the personnel table runs this body up to 28 times
+        append, extend, wrapped_items = items.append, items.extend, self._wrapped_items
+        for first, cells_x in ((0, SPLIT_LEFT_CELLS_X), (rows_per_side, SPLIT_RIGHT_CELLS_X)):
+            sn_x, name_x, no_x = cells_x
+            for text_drop, (sn, name, no) in zip(text_drops, self._row_texts(rows, fields, first, first + rows_per_side)):
+                text_y = header_y - text_drop
+                append((sn_x, text_y, sn))
+                extend(wrapped_items(c, name, name_x, text_y, SPLIT_NAME_WIDTH, 6))
+                append((no_x, text_y, no))
+        self._draw_text_items(c, items, "Helvetica", 6)
 
     def _draw_unsafe_acts_section(self, c, data, start_y):
-        """Complete unsafe acts section"""
-        section_height = 18*mm
-        section_bottom = start_y - section_height
-
-        c.rect(10*mm, section_bottom, 190*mm, section_height)
-        c.setFont("Helvetica", 8)
-        c.drawString(12*mm, start_y - 3*mm, "6. Unsafe Acts / Conditions Observed")
-
-        header_y = start_y - 7*mm
-        c.line(10*mm, header_y, 200*mm, header_y)
-        c.line(20*mm, section_bottom, 20*mm, header_y)
+        """Unsafe act rows, one line each"""
+        header_y = start_y - UNSAFE_ACTS_HEADER_DROP
 
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(12*mm, header_y + 1*mm, "sn")
-        c.drawString(22*mm, header_y + 1*mm, "Description of Unsafe Acts")
+        items = []
+        rows = self._row_texts(data.unsafe_acts, ("description",), 0, UNSAFE_ACT_ROWS)
+        for text_drop, (sn, description) in zip(UNSAFE_ACT_TEXT_DROPS, rows):
+            text_y = header_y - text_drop
+            items.append((TEXT_X, text_y, sn))
+            items += self._wrapped_items(c, description, DESCRIPTION_X, text_y, DESCRIPTION_WIDTH, 7, max_lines=1)
+        self._draw_text_items(c, items, "Helvetica", 7)
 
-        unsafe_acts = getattr(data, 'unsafe_acts', []) or []
-        row_height = 5.5*mm
+        return start_y - UNSAFE_ACTS_HEIGHT
 
-        for i in range(2):
-            row_y = header_y - (i + 1) * row_height
-            c.line(10*mm, row_y, 200*mm, row_y)
-
-            if i < len(unsafe_acts):
-                act = unsafe_acts[i]
-                c.setFont("Helvetica", 7)
-                c.drawString(12*mm, row_y + 2*mm, str(act.get('sn', i + 1)))
-                self._draw_wrapped_text(c, self._safe_text(act.get('description', '')), 
-                                     22*mm, row_y + 2*mm, 175*mm, 7, max_lines=1)
-
-        return section_bottom
+    def _row_texts(self, rows, fields, start, stop):
+        """rows[start:stop] as (sn, *fields) tuples of strings, normalized once before drawing
+        
+        A missing sn becomes the row's number in the table and other None
+        cells become "". Diary-level fields need no such pass; from_dict()
+        already replaces nulls with the field defaults.
+        """
+        return [(str(start + i + 1 if row.sn is None else row.sn),
+                 *["" if value is None else str(value) for value in map(row.__getattribute__, fields)])
+                for i, row in enumerate(rows[start:stop])]
 
     def _draw_additional_sections(self, c, data, start_y):
-        """Complete additional sections (near miss, obstruction, engineer's note)"""
-        # Near Miss
-        near_miss_height = 12*mm
-        near_miss_bottom = start_y - near_miss_height
-        c.rect(10*mm, near_miss_bottom, 190*mm, near_miss_height)
-        c.setFont("Helvetica", 8)
-        c.drawString(12*mm, near_miss_bottom + 8*mm, "7. Near Miss/Accidents/Incidents:")
-        c.setFont("Helvetica", 7)
-        self._draw_wrapped_text(c, self._safe_text(getattr(data, 'near_miss', '')), 
-                             12*mm, near_miss_bottom + 4*mm, 185*mm, 7)
-
-        # Obstruction
-        obstruction_height = 12*mm
-        obstruction_bottom = near_miss_bottom - obstruction_height
-        c.rect(10*mm, obstruction_bottom, 190*mm, obstruction_height)
-        c.setFont("Helvetica", 8)
-        c.drawString(12*mm, obstruction_bottom + 8*mm, "8. Obstruction/Action Plans:")
-        c.setFont("Helvetica", 7)
-        self._draw_wrapped_text(c, self._safe_text(getattr(data, 'obstruction', '')), 
-                             12*mm, obstruction_bottom + 4*mm, 185*mm, 7)
-
-        # Engineer's Note
-        engineers_height = 20*mm
-        engineers_bottom = obstruction_bottom - engineers_height
-        c.rect(10*mm, engineers_bottom, 190*mm, engineers_height)
-        c.setFont("Helvetica", 8)
-        c.drawString(12*mm, engineers_bottom + 16*mm, "9. Engineer's Note:")
-        c.setFont("Helvetica", 7)
-        self._draw_wrapped_text(c, self._safe_text(getattr(data, 'engineers_note', '')), 
-                             12*mm, engineers_bottom + 10*mm, 185*mm, 7)
-
-        return engineers_bottom
+        """Near miss, obstruction and engineer's note texts, in one text object"""
+        items = []
+        bottom = start_y
+        for name, _, height, _, text_raise in NOTE_SECTIONS:
+            bottom -= height
+            items += self._wrapped_items(c, getattr(data, name), TEXT_X, bottom + text_raise,
+                                         NOTE_TEXT_WIDTH, 7)
+        self._draw_text_items(c, items, "Helvetica", 7)
+        return bottom
 
     def _draw_signatures_section(self, c, data, start_y):
-        """Complete signatures section"""
-        section_height = 30*mm
-        section_bottom = start_y - section_height
-
-        col_width = 190*mm / 3
-        c.line(10*mm + col_width, section_bottom, 10*mm + col_width, start_y)
-        c.line(10*mm + (2*col_width), section_bottom, 10*mm + (2*col_width), start_y)
-
-        c.setFont("Helvetica-Bold", 8)
-        c.drawString(12*mm, start_y - 5*mm, "Prepared by")
-        c.drawString(12*mm + col_width, start_y - 5*mm, "Checked by")
-        c.drawString(12*mm + (2*col_width), start_y - 5*mm, "Approved by")
+        """Names under the signature columns"""
+        section_bottom = start_y - SIGNATURES_HEIGHT
 
-        c.setFont("Helvetica", 7)
-        c.drawString(12*mm, start_y - 9*mm, "Construction Staff")
-        c.drawString(12*mm + col_width, start_y - 9*mm, "Consultant Supervision Staff")
-        c.drawString(12*mm + (2*col_width), start_y - 9*mm, "Consultant Supervision Staff")
-
-        c.drawString(12*mm, start_y - 15*mm, f"Name: {self._safe_text(getattr(data, 'prepared_by', ''))}")
-        c.drawString(12*mm + col_width, start_y - 15*mm, f"Name: {self._safe_text(getattr(data, 'checked_by', ''))}")
-        c.drawString(12*mm + (2*col_width), start_y - 15*mm, f"Name: {self._safe_text(getattr(data, 'approved_by', ''))}")
-
-        c.drawString(12*mm, start_y - 20*mm, "Sign: ________________")
-        c.drawString(12*mm + col_width, start_y - 20*mm, "Sign: ________________")
-        c.drawString(12*mm + (2*col_width), start_y - 20*mm, "Sign: ________________")
+        names = (data.prepared_by, data.checked_by, data.approved_by)
+        self._draw_text_items(c, [(col_x + CELL_PAD, start_y - SIGNATURE_NAME_DROP, f"Name: {name}")
+                                  for col_x, name in zip(SIGNATURE_COLS_X, names)], "Helvetica", 7)
 
         return section_bottom
 
-    def _safe_text(self, text):
-        """Safely convert text to string"""
-        return str(text) if text is not None else ""
-
     def _draw_wrapped_text(self, c, text, x, y, max_width, font_size, max_lines=1):
         """Improved text wrapping with line limit and ellipsis for overflow"""
-        c.setFont("Helvetica", font_size)
-        words = text.split()
-        lines = []
-        current_line = []
+        self._draw_text_items(c, self._wrapped_items(c, text, x, y, max_width, font_size, max_lines),
+                              "Helvetica", font_size)
+
+    def _wrapped_items(self, c, text, x, y, max_width, font_size, max_lines=1):
+        """Wrap text into (x, y, line) items for _draw_text_items, one per line"""
+        if not text:
+            return []
+        lines = wrap_lines(text, max_width, font_size, max_lines)
+        return [(x, y - (i * (font_size + 1)), line) for i, line in enumerate(lines)]
+
+    def _draw_text_items(self, c, items, font_name, font_size):
+        """Draw (x, y, text) items in a single text object
         
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            if c.stringWidth(test_line, "Helvetica", font_size) <= max_width:
-                current_line.append(word)
-            else:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-                if len(lines) >= max_lines:
-                    break
+        One BT/ET block instead of one per drawString. The font is set on the
+        canvas, not the text object, so the canvas' font state stays accurate.
+        """
+        if not items:
+            return
+        self._set_font(c, font_name, font_size)
+        text = c.beginText()
+        for x, y, line in items:
+            text.setTextOrigin(x, y)
+            text.textOut(line)
+        c.drawText(text)
+
+    def _set_font(self, c, font_name, font_size):
+        """c.setFont(), skipped when the canvas already has that font
         
-        if current_line and len(lines) < max_lines:
-            lines.append(' '.join(current_line))
-        
-        for i, line in enumerate(lines[:max_lines]):
-            c.drawString(x, y - (i * (font_size + 1)), line)
-        
-        # Add ellipsis if text was truncated
-        if len(lines) == max_lines and len(' '.join(lines)) < len(text):
-            last_line = lines[-1]
-            # Find how much we can fit with ellipsis
-            while last_line and c.stringWidth(last_line + "...", "Helvetica", font_size) > max_width:
-                last_line = last_line[:-1]
-            if last_line:
-                c.drawString(x, y - ((max_lines-1) * (font_size + 1)), last_line + "...")
+        Checks the canvas' own font state, which is per PDF, so this stays
+        safe on a generator shared between sessions.
+        """
+        if c._fontname != font_name or c._fontsize != font_size:
+            c.setFont(font_name, font_size)
 
     def _draw_text_in_cell(self, c, text, x, y, max_width):
         """Legacy method kept for compatibility"""
         self._draw_wrapped_text(c, text, x, y, max_width, c._fontsize)
+
+
+# Generator of the current worker process in generate_many()
+_worker_generator = None
+
+
+def _init_worker():
+    """Process pool initializer: one generator per worker"""
+    global _worker_generator
+    _worker_generator = EnhancedPDFGenerator()
+
+
+def _generate_from_json(data: bytes) -> bytes:
+    """Render one diary sent as DailyDiaryData.to_json_bytes()"""
+    return _worker_generator.generate(DailyDiaryData.from_json(data))
+
+
+def generate_many(diaries: List[DailyDiaryData], max_workers: Optional[int] = None) -> List[bytes]:
+    """
+    Generate several diary PDFs in parallel worker processes
+    
+    Each worker builds one generator, so logos and the page skeleton are
+    prepared once per worker. Diaries travel as their cached
+    to_json_bytes(). Meant for batch scripts rather than the Streamlit app.
+    
+    Args:
+        diaries: Diaries to render
+        max_workers: Worker processes (default: CPU count)
+        
+    Returns:
+        PDF bytes of each diary, in input order
+    """
+    if len(diaries) <= 1:
+        return [EnhancedPDFGenerator().generate(data) for data in diaries]
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        return list(pool.map(_generate_from_json, [data.to_json_bytes() for data in diaries]))
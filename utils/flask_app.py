@@ -1,22 +1,40 @@
 # flask_app.py
 
+import io
 import os
+from functools import lru_cache
 from flask import Flask, request, render_template, send_file, flash, redirect, url_for
 from werkzeug.utils import secure_filename
-from utils.pdf_parser import parse_pdf
-from utils.gemini_processor import process_text
-from utils.enhanced_pdf_generator import generate_pdf
+from utils.pdf_parser import PDFParser
+from utils.gemini_processor import GeminiProcessor
+from utils.enhanced_pdf_generator import EnhancedPDFGenerator, PDFGenerationError
 from dotenv import load_dotenv
 
 load_dotenv()  # will pull GOOGLE_API_KEY into os.environ
 
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
 
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'change-me')
 
+# Shared by all requests and worker threads; neither keeps per-request state,
+# so the OCR setup and the generator's cached page skeleton and logos are
+# paid for once per process
+pdf_parser = PDFParser()
+pdf_generator = EnhancedPDFGenerator()
+
+@lru_cache(maxsize=None)
+def get_gemini_processor(api_key):
+    """Gemini client shared across requests, so its connections are reused"""
+    return GeminiProcessor(api_key=api_key)
+
+@app.errorhandler(PDFGenerationError)
+def pdf_generation_failed(error):
+    """Log the failure with its original traceback and send the user back to the form"""
+    app.logger.error('PDF generation failed', exc_info=error)
+    flash('Could not generate the diary PDF.')
+    return redirect(url_for('index'))
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -31,14 +49,19 @@ def index():
             return redirect(request.url)
 
         filename = secure_filename(file.filename)
-        path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(path)
+        # The upload is processed in memory; nothing is written to disk
+        pdf_bytes = file.read()
 
         # 1) parse → 2) AI process → 3) generate PDF
-        parsed = parse_pdf(path)
-        ai_out = process_text(parsed.text, metadata=parsed.metadata)
-        output = generate_pdf(ai_out, metadata=parsed.metadata)
+        raw_text = pdf_parser.extract_text_from_pdf(pdf_bytes)
+        data = get_gemini_processor(os.getenv('GOOGLE_API_KEY', '')).extract_site_report_data(raw_text)
+        if data is None:
+            flash('Could not extract structured data from the PDF.')
+            return redirect(request.url)
+
+        output = io.BytesIO()
+        pdf_generator.generate(data, out=output)
+        output.seek(0)
 
         return send_file(
             output,
@@ -1,85 +1,97 @@
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+import hashlib
 import json
+import logging
+import os
+import random
 import re
-from typing import Optional, Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Tuple, Union, get_args, get_origin
 from utils.data_models import DailyDiaryData
 import streamlit as st
 
-class GeminiProcessor:
-    """Class for processing site reports using Gemini AI"""
-    
-    def __init__(self, api_key: str):
-        """
-        Initialize Gemini processor
-        
-        Args:
-            api_key: Google Gemini API key
-        """
-        self.api_key = api_key
-        self.model = None
-        self.setup_gemini()
-    
-    def setup_gemini(self):
-        """Configure Gemini AI"""
-        try:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-        except Exception as e:
-            st.error(f"Failed to initialize Gemini AI: {str(e)}")
-            raise e
-    
-    def extract_site_report_data(self, raw_text: str) -> Optional[DailyDiaryData]:
-        """
-        Extract structured data from site report text using Gemini AI
-        
-        Args:
-            raw_text: Raw text extracted from site report
-            
-        Returns:
-            DailyDiaryData: Structured data object
-        """
-        try:
-            # Create extraction prompt
-            prompt = self.create_extraction_prompt(raw_text)
-            
-            # Generate response using Gemini
-            response = self.model.generate_content(prompt)
-            self.last_response_text = response.text if response and response.text else "❌ No text in Gemini response"
-            
-            if response and response.text:
-                # Parse the response
-                structured_data = self.parse_gemini_response(response.text)
-                
-                if structured_data:
-                    # Convert to DailyDiaryData object
-                    return self.convert_to_daily_diary_data(structured_data)
-            
-            return None
-            
-        except Exception as e:
-            st.error(f"Error processing with Gemini AI: {str(e)}")
-            return None
-    
-    def create_extraction_prompt(self, raw_text: str) -> str:
-        """
-        Create a detailed prompt for Gemini AI to extract site report data
-        
-        Args:
-            raw_text: Raw text from site report
-            
-        Returns:
-            str: Formatted prompt
-        """
-        
-        prompt = f"""
+try:
+    import orjson  # optional, much faster JSON decoding of large responses
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Transient Gemini failures (rate limits, server errors) worth retrying
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+MAX_ATTEMPTS = 5
+MAX_BACKOFF_SECONDS = 30
+
+# Follow-up turns asking Gemini to correct a reply that did not parse,
+# convert or validate; sent straight away, since the reply was not an error
+# (transient API errors are retried with backoff in _generate_with_retry)
+FEEDBACK_ATTEMPTS = 2
+
+# Upper bound on concurrent Gemini requests, across all sessions and batches
+MAX_CONCURRENT_REQUESTS = 4
+_REQUEST_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# DailyDiaryData.validate() errors that only mean the report lacks the
+# field; asking the model again would not fix them
+ABSENT_FIELD_ERRORS = frozenset({"Project name is required", "Date is required"})
+
+MODEL_NAME = 'gemini-1.5-flash'
+# Bump when the prompt or the response conversion changes, so cached extractions are redone
+PROMPT_VERSION = 2
+# Where extractions are cached on disk; off unless GEMINI_CACHE_DIR is set.
+# A relative path is taken from the repository root, not the working directory
+CACHE_DIR = os.getenv('GEMINI_CACHE_DIR', '')
+if CACHE_DIR:
+    CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), CACHE_DIR)
+# Cached extractions older than this are discarded and redone
+CACHE_MAX_AGE = timedelta(days=float(os.getenv('GEMINI_CACHE_MAX_AGE_DAYS', '30')))
+
+# Response parsing and field cleanup patterns, compiled once
+# JSON strings (skipped whole, so braces inside them don't count) and braces
+_JSON_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|[{}]')
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_KEY_VALUE_PATTERNS = {
+    key: re.compile(rf'{key}[:\s]*([^\n]+)', re.IGNORECASE)
+    for key in ('project', 'employer', 'consultant', 'contractor', 'date', 'location', 'weather')
+}
+_EDGE_QUOTES_RE = re.compile(r'^["\'\s]+|["\'\s]+$')
+_CAMEL_CASE_RE = re.compile(r'([a-z])([A-Z])')
+_WHITESPACE_RE = re.compile(r'\s+')
+# Common construction-related merged words, e.g. "concretework": each list
+# is one alternation, so the text is scanned once for leading and once for
+# trailing words. Inserted words are lowercased.
+_MERGED_PREFIX_RE = re.compile(
+    r'(loading|material|concrete|steel|excavation|construction|equipment)(?=[a-z])', re.IGNORECASE)
+_MERGED_SUFFIX_RE = re.compile(r'(?<=[a-z])(work|site|area|pipe|road|bridge)\b', re.IGNORECASE)
+# Every spacing fix above needs a letter; values without one (serial
+# numbers, hours, quantities) skip them
+_LETTER_RE = re.compile(r'[a-z]', re.IGNORECASE)
+
+
+# Static halves of the extraction prompt, around the report text; plain
+# concatenation, so the large body is never re-formatted
+_PROMPT_PREFIX = """
 You are an expert data extraction specialist for construction site reports. Extract structured information from the following site report text and return it as a JSON object.
 
 SITE REPORT TEXT:
-{raw_text}
+"""
+
+_PROMPT_SUFFIX = """
 
 Extract the following information and return it as a valid JSON object with these exact keys:
 
-{{
+{
     "project": "project name or description",
     "employer": "employer/client name",
     "consultant": "consultant company name", 
@@ -90,16 +102,16 @@ Extract the following information and return it as a valid JSON object with thes
     "location": "work location or site location",
     "weather": "weather condition (e.g., Sunny/Dry, Rainy, Cloudy)",
     "activities": [
-        {{
+        {
             "sn": 1,
             "description": "activity description",
             "location": "specific location if mentioned",
             "quantity": "quantity if mentioned",
             "unit": "unit if mentioned"
-        }}
+        }
     ],
     "equipment": [
-        {{
+        {
             "sn": 1,
             "equipment": "equipment name/type",
             "no": "equipment number/ID",
@@ -107,32 +119,32 @@ Extract the following information and return it as a valid JSON object with thes
             "idle_hours": "idle hours if mentioned",
             "status": "working status",
             "remarks": "any remarks"
-        }}
+        }
     ],
     "personnel": [
-        {{
+        {
             "sn": 1,
             "personnel": "personnel type/role",
             "no": "number of personnel",
             "hours": "working hours if mentioned",
             "role": "specific role description"
-        }}
+        }
     ],
     "materials": [
-        {{
+        {
             "type": "material type",
             "unit": "unit of measurement",
             "quantity": "quantity used",
             "location": "where used"
-        }}
+        }
     ],
     "unsafe_acts": [
-        {{
+        {
             "sn": 1,
             "description": "description of unsafe act or condition",
             "severity": "severity level if mentioned",
             "action_taken": "corrective action if mentioned"
-        }}
+        }
     ],
     "near_miss": "near miss incidents description",
     "obstruction": "any obstructions or delays",
@@ -143,7 +155,7 @@ Extract the following information and return it as a valid JSON object with thes
     "document_number": "document number if available",
     "page_number": "page number if available",
     "revision": "revision number if available"
-}}
+}
 
 EXTRACTION RULES:
 1. Extract information accurately from the provided text
@@ -159,8 +171,356 @@ EXTRACTION RULES:
 
 RESPOND WITH JSON ONLY:
 """
+
+
+class _NoJSONError(ValueError):
+    """The response contains no JSON at all (as opposed to broken JSON)"""
+
+
+def _json_loads(text):
+    """json.loads(), through orjson when available
+    
+    Falls back to json for the few inputs orjson rejects, such as NaN.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _json_objects(text: str):
+    """Yield each top-level balanced {...} in text, in order
+    
+    One pass over the text: a regex steps over JSON strings and braces, so
+    the scan itself runs in C. An unbalanced tail yields nothing.
+    """
+    depth = 0
+    start = 0
+    for token in _JSON_TOKEN_RE.finditer(text):
+        brace = token.group()
+        if brace == '{':
+            if depth == 0:
+                start = token.start()
+            depth += 1
+        elif brace == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:token.end()]
+
+
+def _split_after(match) -> str:
+    return match.group(1).lower() + ' '
+
+
+def _split_before(match) -> str:
+    return ' ' + match.group(1).lower()
+
+
+# JSON schema type for each scalar field type in data_models
+_SCHEMA_TYPES = {str: 'string', bool: 'boolean', int: 'integer'}
+
+
+def _response_schema(cls) -> Dict:
+    """Gemini response schema for a data model dataclass, rows included"""
+    properties = {}
+    for f in fields(cls):
+        if not f.init:
+            continue
+        field_type = f.type
+        if get_origin(field_type) is Union:  # Optional[X]
+            field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+        if get_origin(field_type) is list:
+            properties[f.name] = {'type': 'array', 'items': _response_schema(get_args(field_type)[0])}
+        else:
+            properties[f.name] = {'type': _SCHEMA_TYPES[field_type]}
+    return {'type': 'object', 'properties': properties}
+
+
+# Structured output: Gemini returns bare JSON in the DailyDiaryData shape,
+# so parse_gemini_response's first candidate parses as-is
+RESPONSE_SCHEMA = _response_schema(DailyDiaryData)
+
+
+# genai.configure() is process-wide and a model only binds its client on
+# its first call, so a second key would silently apply to every model. The
+# process therefore uses one API key, set by the first processor.
+_configure_lock = threading.Lock()
+_configured_api_key = None
+
+
+def _get_model(api_key: str, model_name: str):
+    """GenerativeModel shared by every processor with the same API key
+    
+    genai is configured on first use and again whenever the key changes
+    (e.g. after a first attempt with an empty or wrong key). A model keeps
+    the client it opens on its first call, so later processors reuse the
+    connection; a model that has made a call keeps its key after a change.
+    """
+    global _configured_api_key
+    with _configure_lock:
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+            _shared_model.cache_clear()
+        return _shared_model(model_name)
+
+
+@lru_cache(maxsize=None)
+def _shared_model(model_name: str):
+    """One GenerativeModel per model name, with structured JSON output"""
+    return genai.GenerativeModel(
+        model_name,
+        generation_config=genai.GenerationConfig(
+            response_mime_type='application/json',
+            response_schema=RESPONSE_SCHEMA
+        )
+    )
+
+
+_DATE_PATTERNS = (
+    re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})'),  # DD/MM/YYYY or DD-MM-YYYY
+    re.compile(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})'),  # YYYY/MM/DD or YYYY-MM-DD
+    re.compile(r'(\d{1,2})\s+(\w+)\s+(\d{4})'),        # DD Month YYYY
+)
+
+
+class ExtractionCache:
+    """Extracted diaries on disk, one JSON file per (model, prompt version, input text)
+    
+    Survives restarts and is shared by the Streamlit and Flask apps, so
+    re-processing the same report skips the Gemini round trip. Entries
+    expire after CACHE_MAX_AGE.
+    """
+    
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+    
+    def _path(self, raw_text: str) -> str:
+        key = hashlib.sha256(raw_text.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{MODEL_NAME}_{PROMPT_VERSION}_{key}.json")
+    
+    def get(self, raw_text: str) -> Optional[Tuple[DailyDiaryData, str]]:
+        """The cached (diary, raw response text), or None on a miss or an expired entry"""
+        path = self._path(raw_text)
+        try:
+            with open(path, 'rb') as f:
+                entry = _json_loads(f.read())
+            if datetime.now(timezone.utc) - datetime.fromisoformat(entry['created']) > CACHE_MAX_AGE:
+                raise ValueError("expired")
+            return DailyDiaryData.from_dict(entry['data']), entry.get('response_text', '')
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Expired, unreadable or written for an older schema: drop it and extract again
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+    
+    def put(self, raw_text: str, data: DailyDiaryData, response_text: str):
+        """Store an extraction; written to a temporary file and renamed into place"""
+        path = self._path(raw_text)
+        entry = {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'response_text': response_text,
+            'data': data.to_dict(),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            if orjson is not None:
+                encoded = orjson.dumps(entry, default=str)
+            else:
+                encoded = json.dumps(entry, ensure_ascii=False, default=str).encode('utf-8')
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # Logged rather than shown: the Flask app uses this cache too
+            logger.warning("Could not cache the Gemini extraction: %s", e)
+
+class GeminiProcessor:
+    """Class for processing site reports using Gemini AI"""
+    
+    def __init__(self, api_key: str, cache_dir: Optional[str] = CACHE_DIR):
+        """
+        Initialize Gemini processor
         
-        return prompt
+        Args:
+            api_key: Google Gemini API key
+            cache_dir: Directory for the extraction cache; empty or None disables it
+        """
+        self.api_key = api_key
+        self.model = None
+        self.cache = ExtractionCache(cache_dir) if cache_dir else None
+        self.setup_gemini()
+    
+    def setup_gemini(self):
+        """Configure Gemini AI"""
+        try:
+            self.model = _get_model(self.api_key, MODEL_NAME)
+        except Exception as e:
+            st.error(f"Failed to initialize Gemini AI: {str(e)}")
+            raise e
+    
+    def extract_site_report_data(self, raw_text: str) -> Optional[DailyDiaryData]:
+        """
+        Extract structured data from site report text using Gemini AI
+        
+        Args:
+            raw_text: Raw text extracted from site report
+            
+        Returns:
+            DailyDiaryData: Structured data object
+        """
+        data, self.last_response_text = self._extract(raw_text)
+        return data
+    
+    def extract_many(self, raw_texts: List[str], initializer=None,
+                     initargs=()) -> List[Tuple[Optional[DailyDiaryData], Optional[str]]]:
+        """
+        Extract structured data from several site reports concurrently
+        
+        The requests overlap on the network, so the total time is close to
+        the slowest single call instead of the sum of all of them.
+        
+        Args:
+            raw_texts: Raw text of each site report
+            initializer, initargs: Run in each worker thread before its first
+                report, e.g. to attach the Streamlit script context
+            
+        Returns:
+            (DailyDiaryData or None, raw response text) per report, in input order
+        """
+        if len(raw_texts) <= 1:
+            return [self._extract(text) for text in raw_texts]
+        
+        workers = min(MAX_CONCURRENT_REQUESTS, len(raw_texts))
+        with ThreadPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+            return list(pool.map(self._extract, raw_texts))
+    
+    def _extract(self, raw_text: str) -> Tuple[Optional[DailyDiaryData], Optional[str]]:
+        """extract_site_report_data() returning the response text instead of storing it"""
+        try:
+            if self.cache is not None:
+                cached = self.cache.get(raw_text)
+                if cached is not None:
+                    return cached
+            
+            # Create extraction prompt
+            prompt = self.create_extraction_prompt(raw_text)
+            
+            # Generate, parse and convert the response using Gemini
+            data, response_text, complete = self._request_diary(prompt)
+            
+            # Only cache clean extractions with content; a fallback or empty
+            # result is requested again next time
+            if complete and self.cache is not None and data.has_content():
+                self.cache.put(raw_text, data, response_text)
+            return data, response_text or "❌ No text in Gemini response"
+            
+        except Exception as e:
+            st.error(f"Error processing with Gemini AI: {str(e)}")
+            return None, None
+    
+    def _request_diary(self, prompt: str) -> Tuple[Optional[DailyDiaryData], Optional[str], bool]:
+        """
+        Ask Gemini for the diary, feeding errors back for a corrected reply
+        
+        A reply that does not parse, fails conversion or fails validation is
+        answered in the same conversation with the errors, up to
+        FEEDBACK_ATTEMPTS times, so the extraction is not lost. If no reply
+        passes, the diary with the fewest validation errors so far is
+        returned as is; a later reply that is empty or unusable doesn't
+        replace it. With no such diary, a reply with no JSON at all falls
+        back to extract_key_value_from_text().
+        
+        Args:
+            prompt: Extraction prompt
+            
+        Returns:
+            (DailyDiaryData or None, text of the last response or None,
+            whether the reply parsed as JSON and passed conversion and validation)
+        """
+        contents = [{'role': 'user', 'parts': [prompt]}]
+        response_text = error = problem = None
+        # (data, response text, error count) of the best reply that converted
+        best = None
+        for attempt in range(FEEDBACK_ATTEMPTS + 1):
+            response = self._generate_with_retry(contents)
+            if not (response and response.text):
+                break
+            response_text = response.text
+            
+            try:
+                data = self._convert_structured_data(self._parse_response_text(response_text))
+            except Exception as e:
+                error = e
+                problem = f"could not be processed: {e}"
+            else:
+                errors = [err for err in data.validate() if err not in ABSENT_FIELD_ERRORS]
+                if not errors:
+                    return data, response_text, True
+                if best is None or len(errors) <= best[2]:
+                    best = (data, response_text, len(errors))
+                error = None
+                problem = "failed validation: " + "; ".join(errors)
+            
+            if attempt < FEEDBACK_ATTEMPTS:
+                contents += [
+                    {'role': 'model', 'parts': [response_text]},
+                    {'role': 'user', 'parts': [
+                        f"Your reply {problem}. "
+                        "Reply again with only the corrected JSON object."
+                    ]},
+                ]
+        
+        if problem is not None:
+            st.warning(f"Gemini response {problem}")
+        if best is not None:
+            return best[0], best[1], False
+        if isinstance(error, _NoJSONError):
+            # Last resort for a prose reply: pick out "key: value" lines
+            return self.convert_to_daily_diary_data(self.extract_key_value_from_text(response_text.strip())), response_text, False
+        return None, response_text, False
+    
+    def _generate_with_retry(self, prompt):
+        """
+        Call Gemini, retrying transient errors with randomized exponential backoff
+        
+        At most MAX_CONCURRENT_REQUESTS calls are in flight process-wide, so
+        several sessions running extract_many() at once stay within it.
+        
+        Args:
+            prompt: Prompt, or conversation contents, to send
+            
+        Returns:
+            Gemini response object
+        """
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                # A slot is held only for the call itself, not the backoff
+                with _REQUEST_SLOTS:
+                    return self.model.generate_content(prompt)
+            except RETRYABLE_ERRORS:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                time.sleep(random.uniform(1, min(MAX_BACKOFF_SECONDS, 2 ** attempt)))
+    
+    def create_extraction_prompt(self, raw_text: str) -> str:
+        """
+        Create a detailed prompt for Gemini AI to extract site report data
+        
+        Args:
+            raw_text: Raw text from site report
+            
+        Returns:
+            str: Formatted prompt
+        """
+        return _PROMPT_PREFIX + raw_text + _PROMPT_SUFFIX
     
     def parse_gemini_response(self, response_text: str) -> Optional[Dict]:
         """
@@ -173,30 +533,43 @@ RESPOND WITH JSON ONLY:
             Dict: Parsed structured data or None if parsing failed
         """
         try:
-            # Clean the response text
-            cleaned_text = response_text.strip()
-            
-            # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', cleaned_text, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(0)
-                
-                # Parse JSON
-                structured_data = json.loads(json_text)
-                return structured_data
-            
-            # If no JSON found, try to parse the entire response
-            try:
-                structured_data = json.loads(cleaned_text)
-                return structured_data
-            except json.JSONDecodeError:
-                # Last resort: extract key-value pairs manually
-                return self.extract_key_value_from_text(cleaned_text)
-                
+            return self._parse_response_text(response_text)
+        except _NoJSONError:
+            # Last resort: extract key-value pairs manually
+            return self.extract_key_value_from_text(response_text.strip())
         except Exception as e:
             st.warning(f"Failed to parse Gemini response: {str(e)}")
             return None
     
+    def _parse_response_text(self, response_text: str) -> Dict:
+        """parse_gemini_response() that raises instead of warning or guessing, for the feedback turn"""
+        # Clean the response text
+        cleaned_text = response_text.strip()
+        
+        # Try each top-level {...} in the response; the model sometimes
+        # wraps the JSON in prose or code fences, or leaves trailing commas
+        first_error = None
+        for json_text in _json_objects(cleaned_text):
+            try:
+                return _json_loads(json_text)
+            except ValueError as e:
+                first_error = first_error or e
+            try:
+                return _json_loads(_TRAILING_COMMA_RE.sub(r'\1', json_text))
+            except ValueError:
+                pass
+        if first_error is not None:
+            raise first_error
+        
+        # If no JSON found, try to parse the entire response
+        try:
+            structured_data = _json_loads(cleaned_text)
+        except ValueError:
+            raise _NoJSONError("the reply contains no JSON object") from None
+        if not isinstance(structured_data, dict):
+            raise ValueError("expected a JSON object")
+        return structured_data
+    
     def extract_key_value_from_text(self, text: str) -> Dict:
         """
         Extract key-value pairs from text when JSON parsing fails
@@ -234,18 +607,8 @@ RESPOND WITH JSON ONLY:
         }
         
         # Extract basic information using regex patterns
-        patterns = {
-            'project': r'project[:\s]*([^\n]+)',
-            'employer': r'employer[:\s]*([^\n]+)',
-            'consultant': r'consultant[:\s]*([^\n]+)',
-            'contractor': r'contractor[:\s]*([^\n]+)',
-            'date': r'date[:\s]*([^\n]+)',
-            'location': r'location[:\s]*([^\n]+)',
-            'weather': r'weather[:\s]*([^\n]+)',
-        }
-        
-        for key, pattern in patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
+        for key, pattern in _KEY_VALUE_PATTERNS.items():
+            match = pattern.search(text)
             if match:
                 extracted_data[key] = match.group(1).strip()
         
@@ -262,51 +625,54 @@ RESPOND WITH JSON ONLY:
             DailyDiaryData: Structured data object
         """
         try:
-            # Clean and validate the data
-            cleaned_data = {}
-            
-            # Basic text fields
-            text_fields = ['project', 'employer', 'consultant', 'contractor', 'location', 
-                          'weather', 'near_miss', 'obstruction', 'engineers_note', 
-                          'prepared_by', 'checked_by', 'approved_by', 'document_number', 
-                          'page_number', 'revision']
-            
-            for field in text_fields:
-                value = structured_data.get(field, '')
-                cleaned_data[field] = self._clean_text(str(value)) if value else ''
-            
-            # Date validation and formatting
-            date_str = structured_data.get('date', '')
-            cleaned_data['date'] = self._validate_date(date_str)
-            
-            # Boolean fields
-            cleaned_data['time_morning'] = bool(structured_data.get('time_morning', False))
-            cleaned_data['time_afternoon'] = bool(structured_data.get('time_afternoon', False))
-            
-            # List fields with validation
-            list_fields = {
-                'activities': ['sn', 'description', 'location', 'quantity', 'unit'],
-                'equipment': ['sn', 'equipment', 'no', 'operating_hours', 'idle_hours', 'status', 'remarks'],
-                'personnel': ['sn', 'personnel', 'no', 'hours', 'role'],
-                'materials': ['type', 'unit', 'quantity', 'location'],
-                'unsafe_acts': ['sn', 'description', 'severity', 'action_taken']
-            }
-            
-            for list_field, required_fields in list_fields.items():
-                raw_list = structured_data.get(list_field, [])
-                if isinstance(raw_list, list):
-                    cleaned_data[list_field] = self._validate_and_clean_list(raw_list, required_fields)
-                else:
-                    cleaned_data[list_field] = []
-            
-            # Create DailyDiaryData object
-            return DailyDiaryData.from_dict(cleaned_data)
-            
+            return self._convert_structured_data(structured_data)
         except Exception as e:
             st.warning(f"Error converting data: {str(e)}")
             # Return minimal valid object
             return DailyDiaryData()
     
+    def _convert_structured_data(self, structured_data: Dict) -> DailyDiaryData:
+        """convert_to_daily_diary_data() that raises instead of returning an empty diary"""
+        # Clean and validate the data
+        cleaned_data = {}
+        
+        # Basic text fields
+        text_fields = ['project', 'employer', 'consultant', 'contractor', 'location', 
+                      'weather', 'near_miss', 'obstruction', 'engineers_note', 
+                      'prepared_by', 'checked_by', 'approved_by', 'document_number', 
+                      'page_number', 'revision']
+        
+        for field in text_fields:
+            value = structured_data.get(field, '')
+            cleaned_data[field] = self._clean_text(str(value)) if value else ''
+        
+        # Date validation and formatting
+        date_str = structured_data.get('date', '')
+        cleaned_data['date'] = self._validate_date(date_str)
+        
+        # Boolean fields
+        cleaned_data['time_morning'] = bool(structured_data.get('time_morning', False))
+        cleaned_data['time_afternoon'] = bool(structured_data.get('time_afternoon', False))
+        
+        # List fields with validation
+        list_fields = {
+            'activities': ['sn', 'description', 'location', 'quantity', 'unit'],
+            'equipment': ['sn', 'equipment', 'no', 'operating_hours', 'idle_hours', 'status', 'remarks'],
+            'personnel': ['sn', 'personnel', 'no', 'hours', 'role'],
+            'materials': ['type', 'unit', 'quantity', 'location'],
+            'unsafe_acts': ['sn', 'description', 'severity', 'action_taken']
+        }
+        
+        for list_field, required_fields in list_fields.items():
+            raw_list = structured_data.get(list_field, [])
+            if isinstance(raw_list, list):
+                cleaned_data[list_field] = self._validate_and_clean_list(raw_list, required_fields)
+            else:
+                cleaned_data[list_field] = []
+        
+        # Create DailyDiaryData object
+        return DailyDiaryData.from_dict(cleaned_data)
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text data while preserving proper word spacing"""
         if not text or text == 'null':
@@ -316,34 +682,20 @@ RESPOND WITH JSON ONLY:
         cleaned = ' '.join(str(text).split())
         
         # Remove common artifacts
-        cleaned = re.sub(r'^["\'\s]+|["\'\s]+$', '', cleaned)
+        cleaned = _EDGE_QUOTES_RE.sub('', cleaned)
+        if not _LETTER_RE.search(cleaned):
+            return cleaned
         
         # Fix common word spacing issues that may come from OCR or AI extraction
         # Add spaces between lowercase and uppercase letters (merged words)
-        cleaned = re.sub(r'([a-z])([A-Z])', r'\1 \2', cleaned)
+        cleaned = _CAMEL_CASE_RE.sub(r'\1 \2', cleaned)
         
         # Fix common construction-related merged words
-        word_patterns = [
-            (r'loading([a-z])', r'loading \1'),
-            (r'material([a-z])', r'material \1'),
-            (r'concrete([a-z])', r'concrete \1'),
-            (r'steel([a-z])', r'steel \1'),
-            (r'excavation([a-z])', r'excavation \1'),
-            (r'construction([a-z])', r'construction \1'),
-            (r'equipment([a-z])', r'equipment \1'),
-            (r'([a-z])work\b', r'\1 work'),
-            (r'([a-z])site\b', r'\1 site'),
-            (r'([a-z])area\b', r'\1 area'),
-            (r'([a-z])pipe\b', r'\1 pipe'),
-            (r'([a-z])road\b', r'\1 road'),
-            (r'([a-z])bridge\b', r'\1 bridge'),
-        ]
-        
-        for pattern, replacement in word_patterns:
-            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
+        cleaned = _MERGED_PREFIX_RE.sub(_split_after, cleaned)
+        cleaned = _MERGED_SUFFIX_RE.sub(_split_before, cleaned)
         
         # Clean up any double spaces created
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
         
         return cleaned
     
@@ -353,14 +705,8 @@ RESPOND WITH JSON ONLY:
             return ''
         
         # Try to extract date from various formats
-        date_patterns = [
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # DD/MM/YYYY or DD-MM-YYYY
-            r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',  # YYYY/MM/DD or YYYY-MM-DD
-            r'(\d{1,2})\s+(\w+)\s+(\d{4})',        # DD Month YYYY
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, str(date_str))
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(str(date_str))
             if match:
                 try:
                     if len(match.groups()) == 3:
@@ -390,14 +736,15 @@ RESPOND WITH JSON ONLY:
             for field in required_fields:
                 if field != 'sn':
                     value = item.get(field, '')
-                    cleaned_item[field] = self._clean_text(str(value)) if value else ''
+                    cleaned_item[field] = self._clean_text(value) if value else ''
             
             # Special handling for equipment to prevent duplicates
             if 'equipment' in required_fields and 'no' in required_fields:
                 equipment_no = cleaned_item.get('no', '').strip()
                 if equipment_no:
-                    # Normalize equipment number (remove spaces, convert to uppercase)
-                    normalized_no = re.sub(r'\s+', '', equipment_no.upper())
+                    # Normalize equipment number (remove spaces, convert to uppercase);
+                    # _clean_text leaves single ASCII spaces as the only whitespace
+                    normalized_no = equipment_no.upper().replace(' ', '')
                     if normalized_no in seen_equipment:
                         # Skip this duplicate equipment
                         continue
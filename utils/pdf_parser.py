@@ -1,13 +1,158 @@
 import pdfplumber
 import io
+import os
 import pytesseract
 import cv2
 import numpy as np
 from PIL import Image
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import fitz  # PyMuPDF
+import logging
+import math
+import queue
 import re
+from contextlib import contextmanager
+
+try:
+    import tesserocr  # optional, runs Tesseract in-process instead of a subprocess per call
+except ImportError:
+    tesserocr = None
+
+# pdfminer (used by the pdfplumber fallback) logs every font/layout quirk at
+# INFO/DEBUG level; Streamlit captures stderr, so keep it quiet.
+logging.getLogger("pdfminer").setLevel(logging.WARNING)
+
+# PyMuPDF holds the GIL while extracting, so large documents are split across
+# worker processes. Below this many pages per worker the process start-up
+# costs more than it saves.
+PAGES_PER_WORKER = 4
+
+# OpenCV and the Tesseract subprocess release the GIL, so OCR pages overlap
+# on threads
+OCR_WORKERS = os.cpu_count() or 1
+
+# OCR render scale (3x = 216 DPI) and a pixel budget of one A4 page at that
+# scale: larger pages (A3 sheets, drawings) are rendered at a lower DPI so
+# they cost no more than an A4 page to threshold and OCR
+OCR_SCALE = 3.0
+OCR_MAX_PIXELS = 595 * 842 * OCR_SCALE ** 2
+
+# A page whose extracted text, not counting the "--- Page N ---" style
+# markers, is shorter than this is treated as scanned and OCR'd; the other
+# pages keep their text layer
+OCR_MIN_PAGE_CHARS = 20
+
+# Page segmentation modes tried when the primary OCR pass finds little text:
+# single column, single text line, single word, sparse text
+ALT_PSM_MODES = (4, 7, 8, 12)
+
+# Idle (languages, primary, fallback) tesserocr API pairs, shared by every
+# parser and OCR call in the process, so the language models load once per
+# concurrent OCR thread rather than once per page. Each pair holds the full
+# models in memory, hence the cap; surplus pairs are released.
+_TESSEROCR_APIS = queue.LifoQueue(maxsize=OCR_WORKERS)
+
+
+@contextmanager
+def _tesserocr_apis(languages: str):
+    """Borrow a (primary, fallback) tesserocr API pair from the process-wide pool
+    
+    Mirror the pytesseract settings: the primary pass uses the OCR
+    languages, the fallback passes plain English. A pair is used by one
+    thread at a time.
+    """
+    try:
+        apis = _TESSEROCR_APIS.get_nowait()
+    except queue.Empty:
+        apis = None
+    if apis is not None and apis[0] != languages:
+        apis[1].End()
+        apis[2].End()
+        apis = None
+    if apis is None:
+        primary = tesserocr.PyTessBaseAPI(lang=languages, psm=tesserocr.PSM.SINGLE_BLOCK,
+                                          oem=tesserocr.OEM.DEFAULT)
+        fallback = tesserocr.PyTessBaseAPI(lang='eng', oem=tesserocr.OEM.DEFAULT)
+        apis = (languages, primary, fallback)
+    try:
+        yield apis[1], apis[2]
+    finally:
+        try:
+            _TESSEROCR_APIS.put_nowait(apis)
+        except queue.Full:
+            apis[1].End()
+            apis[2].End()
+
+
+# OCR cleanup patterns, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+# The page and table marker lines added to the extracted text
+_MARKER_RE = re.compile(r'^--- .* ---$', re.MULTILINE)
+_CAMEL_CASE_RE = re.compile(r'([a-z])([A-Z])')
+_LETTER_DIGIT_RE = re.compile(r'([a-zA-Z])([0-9])')
+_DIGIT_LETTER_RE = re.compile(r'([0-9])([a-zA-Z])')
+# Common merged words, e.g. "loadingmaterial" -> "loading material": one
+# alternation each for leading and trailing words. Inserted words are lowercased.
+_MERGED_PREFIX_RE = re.compile(
+    r'(loading|material|concrete|excavation|construction|equipment)(?=[a-z])', re.IGNORECASE)
+_MERGED_SUFFIX_RE = re.compile(r'(?<=[a-z])(work|site|area|operation)', re.IGNORECASE)
+
+
+def _split_after(match) -> str:
+    return match.group(1).lower() + ' '
+
+
+def _split_before(match) -> str:
+    return ' ' + match.group(1).lower()
+
+
+def _format_page_text(page, page_num: int) -> str:
+    """Extract the text layer and tables of a single PyMuPDF page"""
+    text_content = ""
+    
+    page_text = page.get_text("text")
+    if page_text.strip():
+        text_content += f"\n--- Page {page_num + 1} ---\n"
+        text_content += page_text + "\n"
+    
+    # Also try to extract tables
+    tables = page.find_tables().tables
+    for table_num, table in enumerate(tables):
+        rows = table.extract()
+        if rows:
+            text_content += f"\n--- Table {table_num + 1} on Page {page_num + 1} ---\n"
+            for row in rows:
+                if row:
+                    row_text = " | ".join([str(cell) if cell else "" for cell in row])
+                    text_content += row_text + "\n"
+    
+    return text_content
+
+
+def _extract_pages_with_pymupdf(pdf_bytes: bytes, page_numbers: List[int]) -> List[Tuple[int, str, Optional[str]]]:
+    """
+    Extract a subset of pages with its own document handle
+    
+    Module-level so it can run in a worker process. Errors are returned
+    rather than reported, since Streamlit calls only work in the main process.
+    
+    Returns:
+        List of (page_num, text, error message or None) tuples
+    """
+    results = []
+    
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_document:
+        for page_num in page_numbers:
+            try:
+                results.append((page_num, _format_page_text(pdf_document[page_num], page_num), None))
+            except Exception as e:
+                results.append((page_num, "", str(e)))
+    
+    return results
+
 
 class PDFParser:
     """Enhanced PDF Parser with high-accuracy OCR and multilingual support"""
@@ -18,8 +163,10 @@ class PDFParser:
     
     def setup_ocr(self):
         """Setup OCR with enhanced configuration for maximum accuracy"""
-        # Configure Tesseract for high accuracy
-        self.ocr_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,!?@#$%^&*()_+-=[]{}|;:\'\"<>/?`~àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿĀāĂăĄąĆćĈĉĊċČčĎďĐđĒēĔĕĖėĘęĚěĜĝĞğĠġĢģĤĥĦħĨĩĪīĬĭĮįİıĲĳĴĵĶķĸĹĺĻļĽľĿŀŁłŃńŅņŇňŉŊŋŌōŎŏŐőŒœŔŕŖŗŘřŚśŜŝŞşŠšŢţŤťŦŧŨũŪūŬŭŮůŰűŲųŴŵŶŷŸŹźŻżŽž'
+        # Configure Tesseract for high accuracy. No character whitelist: it
+        # excluded the CJK and Arabic scripts listed below and was checked
+        # for every candidate glyph
+        self.ocr_config = r'--oem 3 --psm 6'
         
         # Language configuration for multilingual support
         self.languages = 'eng+fra+deu+spa+ita+por+ara+chi_sim+chi_tra+jpn+kor'
@@ -29,22 +176,33 @@ class PDFParser:
         Extract text from PDF using multiple methods for maximum accuracy
         
         Args:
-            uploaded_file: Uploaded PDF file
+            uploaded_file: Uploaded PDF file, or the raw PDF bytes
             
         Returns:
             str: Extracted text with preserved formatting
         """
         try:
-            # Reset file pointer
-            uploaded_file.seek(0)
+            pdf_bytes = self._read_pdf_bytes(uploaded_file)
+            
+            # Method 1: Try PyMuPDF first (C++ text extractor, fastest for text-based PDFs)
+            pages = self._extract_with_pymupdf(pdf_bytes)
+            
+            # Method 2: Fall back to pdfplumber if PyMuPDF could not read the file
+            if pages is None:
+                pages = self._extract_with_pdfplumber(pdf_bytes)
             
-            # Method 1: Try pdfplumber first (best for text-based PDFs)
-            text_content = self._extract_with_pdfplumber(uploaded_file)
+            # OCR only the pages that returned little or no text (all of
+            # them if neither extractor could read the file). When other
+            # pages have a text layer, a short page without images is a
+            # blank separator or signature page and is left as is
+            missing_pages = [page_num for page_num, page_text in pages.items()
+                             if len(_MARKER_RE.sub('', page_text).strip()) < OCR_MIN_PAGE_CHARS]
+            if missing_pages or not pages:
+                ocr_pages = self._extract_with_ocr(pdf_bytes, only_pages=missing_pages if pages else None,
+                                                   images_only=len(missing_pages) < len(pages))
+                pages.update((page_num, page_text) for page_num, page_text in ocr_pages.items() if page_text)
             
-            # If pdfplumber fails or returns minimal text, try OCR
-            if not text_content.strip() or len(text_content.strip()) < 50:
-                uploaded_file.seek(0)
-                text_content = self._extract_with_ocr(uploaded_file)
+            text_content = "".join(pages[page_num] for page_num in sorted(pages))
             
             # Clean and preserve formatting
             cleaned_text = self._clean_and_preserve_text(text_content)
@@ -55,13 +213,59 @@ class PDFParser:
             st.error(f"Error extracting text from PDF: {str(e)}")
             return ""
     
-    def _extract_with_pdfplumber(self, uploaded_file) -> str:
-        """Extract text using pdfplumber for text-based PDFs"""
+    def _read_pdf_bytes(self, uploaded_file) -> bytes:
+        """Return the PDF contents, reading a file-like object only once"""
+        if isinstance(uploaded_file, (bytes, bytearray)):
+            return bytes(uploaded_file)
+        
+        uploaded_file.seek(0)
+        return uploaded_file.read()
+    
+    def _extract_with_pymupdf(self, pdf_bytes: bytes) -> Optional[Dict[int, str]]:
+        """Extract text and tables using PyMuPDF for text-based PDFs
+        
+        Large documents are split across a process pool, each worker opening
+        its own document handle. Returns page number -> text, or None if the
+        document could not be opened, so the caller can fall back to pdfplumber.
+        """
         try:
-            text_content = ""
-            
-            with pdfplumber.open(uploaded_file) as pdf:
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_document:
+                page_count = len(pdf_document)
+        except Exception as e:
+            st.warning(f"PyMuPDF extraction failed: {str(e)}")
+            return None
+        
+        pages = list(range(page_count))
+        workers = min(os.cpu_count() or 1, page_count // PAGES_PER_WORKER)
+        results = None
+        
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(_extract_pages_with_pymupdf, pdf_bytes, pages[i::workers])
+                               for i in range(workers)]
+                    results = sorted(r for future in futures for r in future.result())
+            except Exception as e:
+                st.warning(f"Parallel extraction failed, retrying serially: {str(e)}")
+        
+        if results is None:
+            results = _extract_pages_with_pymupdf(pdf_bytes, pages)
+        
+        pages = {}
+        for page_num, page_text, error in results:
+            if error:
+                st.warning(f"Error extracting from page {page_num + 1}: {error}")
+            pages[page_num] = page_text
+        
+        return pages
+    
+    def _extract_with_pdfplumber(self, pdf_bytes: bytes) -> Dict[int, str]:
+        """Extract text using pdfplumber for text-based PDFs; page number -> text"""
+        pages = {}
+        try:
+            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
                 for page_num, page in enumerate(pdf.pages):
+                    text_content = ""
                     try:
                         page_text = page.extract_text()
                         if page_text:
@@ -80,116 +284,141 @@ class PDFParser:
                     
                     except Exception as e:
                         st.warning(f"Error extracting from page {page_num + 1}: {str(e)}")
-                        continue
+                    
+                    pages[page_num] = text_content
             
-            return text_content
+            return pages
             
         except Exception as e:
             st.warning(f"PDFPlumber extraction failed: {str(e)}")
-            return ""
+            return pages
     
-    def _extract_with_ocr(self, uploaded_file) -> str:
-        """Extract text using OCR for image-based or scanned PDFs"""
+    def _extract_with_ocr(self, pdf_bytes: bytes, only_pages: Optional[List[int]] = None,
+                          images_only: bool = False) -> Dict[int, str]:
+        """Extract text using OCR for image-based or scanned PDFs
+        
+        Only the pages in `only_pages` are rendered and OCR'd (all pages if
+        None), and with `images_only` only those that contain an image.
+        Returns page number -> text for the pages OCR'd.
+        """
         try:
-            text_content = ""
-            
-            # Convert PDF to images using PyMuPDF
-            pdf_document = fitz.open(stream=uploaded_file.read(), filetype="pdf")
+            pages = {}
             
-            for page_num in range(len(pdf_document)):
-                try:
-                    page = pdf_document.load_page(page_num)
-                    
-                    # Convert to image with high DPI for better OCR
-                    mat = fitz.Matrix(3.0, 3.0)  # High resolution matrix
-                    pix = page.get_pixmap(matrix=mat)
-                    img_data = pix.tobytes("png")
-                    
-                    # Convert to PIL Image
-                    pil_image = Image.open(io.BytesIO(img_data))
-                    
-                    # Enhance image for better OCR
-                    enhanced_image = self._enhance_image_for_ocr(pil_image)
-                    
-                    # Perform OCR with multiple methods
-                    page_text = self._perform_enhanced_ocr(enhanced_image)
+            # Convert PDF to images using PyMuPDF, in this thread: a document
+            # handle must not be shared between threads
+            page_images = []
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_document:
+                for page_num in range(len(pdf_document)) if only_pages is None else only_pages:
+                    try:
+                        page = pdf_document.load_page(page_num)
+                        if images_only and not page.get_images():
+                            continue
+                        
+                        # Convert to a grayscale image with high DPI for better OCR;
+                        # the raw samples become a numpy array, with no PNG or PIL step
+                        scale = min(OCR_SCALE, math.sqrt(OCR_MAX_PIXELS / max(page.rect.width * page.rect.height, 1)))
+                        mat = fitz.Matrix(scale, scale)
+                        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY)
+                        page_images.append((page_num, np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)))
                     
-                    if page_text.strip():
-                        text_content += f"\n--- Page {page_num + 1} (OCR) ---\n"
-                        text_content += page_text + "\n"
-                
-                except Exception as e:
-                    st.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
-                    continue
+                    except Exception as e:
+                        st.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
+                        continue
             
-            pdf_document.close()
-            return text_content
+            if not page_images:
+                return pages
+            
+            # Enhance and OCR the pages concurrently; workers share the
+            # caller's script context so st.warning still renders
+            ctx = get_script_run_ctx()
+            workers = min(OCR_WORKERS, len(page_images))
+            with ThreadPoolExecutor(max_workers=workers, initializer=add_script_run_ctx, initargs=(None, ctx)) as pool:
+                page_texts = list(pool.map(self._ocr_page, page_images))
+            
+            for (page_num, _), page_text in zip(page_images, page_texts):
+                if page_text.strip():
+                    pages[page_num] = f"\n--- Page {page_num + 1} (OCR) ---\n" + page_text + "\n"
+            
+            return pages
             
         except Exception as e:
             st.warning(f"OCR extraction failed: {str(e)}")
-            return ""
+            return {}
     
-    def _enhance_image_for_ocr(self, pil_image):
-        """Enhance image quality for better OCR accuracy"""
+    def _ocr_page(self, page_image) -> str:
+        """Enhance and OCR one (page_num, grayscale array) pair; runs on a worker thread"""
+        page_num, gray = page_image
         try:
-            # Convert PIL to OpenCV
-            cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            
-            # Apply Gaussian blur to reduce noise
-            blurred = cv2.GaussianBlur(gray, (1, 1), 0)
+            # Enhance image for better OCR
+            enhanced_image = self._enhance_image_for_ocr(gray)
             
+            # Perform OCR with multiple methods
+            return self._perform_enhanced_ocr(enhanced_image)
+        
+        except Exception as e:
+            st.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
+            return ""
+    
+    def _enhance_image_for_ocr(self, gray):
+        """Enhance a grayscale page array for better OCR accuracy; returns a PIL image"""
+        try:
             # Apply adaptive threshold for better text separation
             thresh = cv2.adaptiveThreshold(
-                blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
             )
             
-            # Morphological operations to clean up
-            kernel = np.ones((1, 1), np.uint8)
-            cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-            
             # Convert back to PIL Image
-            enhanced_image = Image.fromarray(cleaned)
+            enhanced_image = Image.fromarray(thresh)
             
             return enhanced_image
             
         except Exception as e:
             # Return original if enhancement fails
-            return pil_image
+            return Image.fromarray(gray)
     
     def _perform_enhanced_ocr(self, image):
         """Perform OCR with multiple configurations for maximum accuracy"""
         try:
+            if tesserocr is not None:
+                with _tesserocr_apis(self.languages) as (primary, fallback):
+                    return self._run_ocr_passes(image, primary, fallback)
+            return self._run_ocr_passes(image)
+            
+        except Exception as e:
+            st.warning(f"OCR processing failed: {str(e)}")
+            return ""
+    
+    def _run_ocr_passes(self, image, primary=None, fallback=None) -> str:
+        """Primary OCR pass, then the alternative PSM modes if it finds little text
+        
+        Uses the given tesserocr APIs, or pytesseract when they are None.
+        """
+        if primary is not None:
+            primary.SetImage(image)
+            text = primary.GetUTF8Text()
+        else:
             # Primary OCR with high accuracy settings
             text = pytesseract.image_to_string(
                 image, 
                 config=self.ocr_config,
                 lang=self.languages
             )
-            
-            # If primary OCR yields little text, try alternative configurations
-            if len(text.strip()) < 20:
-                # Try with different PSM modes
-                alt_configs = [
-                    r'--oem 3 --psm 4',  # Single column text
-                    r'--oem 3 --psm 7',  # Single text line
-                    r'--oem 3 --psm 8',  # Single word
-                    r'--oem 3 --psm 12'  # Sparse text
-                ]
-                
-                for config in alt_configs:
-                    alt_text = pytesseract.image_to_string(image, config=config)
-                    if len(alt_text.strip()) > len(text.strip()):
-                        text = alt_text
-                        break
-            
-            return text
-            
-        except Exception as e:
-            st.warning(f"OCR processing failed: {str(e)}")
-            return ""
+        
+        # If primary OCR yields little text, try alternative configurations
+        if len(text.strip()) < 20:
+            # Try with different PSM modes
+            for psm in ALT_PSM_MODES:
+                if fallback is not None:
+                    fallback.SetPageSegMode(psm)
+                    fallback.SetImage(image)
+                    alt_text = fallback.GetUTF8Text()
+                else:
+                    alt_text = pytesseract.image_to_string(image, config=f'--oem 3 --psm {psm}')
+                if len(alt_text.strip()) > len(text.strip()):
+                    text = alt_text
+                    break
+        
+        return text
     
     def _clean_and_preserve_text(self, text: str) -> str:
         """Clean text while preserving formatting and multilingual content"""
@@ -219,55 +448,27 @@ class PDFParser:
     def _fix_common_ocr_errors(self, text: str) -> str:
         """Fix common OCR errors while preserving multilingual content"""
         
-        # Common OCR character substitutions
-        corrections = {
-            'rn': 'm',
-            'vv': 'w',
-            '|': 'l',
-            '0': 'O',  # Context-dependent
-            '1': 'I',  # Context-dependent
-            '5': 'S',  # Context-dependent
-        }
-        
-        # Apply corrections selectively (only for clearly misrecognized patterns)
-        corrected_text = text
-        
         # Fix spacing issues while preserving natural word boundaries
-        corrected_text = re.sub(r'\s+', ' ', corrected_text)
+        corrected_text = _WHITESPACE_RE.sub(' ', text)
         
         # Add spaces between concatenated words (common OCR issue)
         # Detect lowercase followed by uppercase (camelCase or merged words)
-        corrected_text = re.sub(r'([a-z])([A-Z])', r'\1 \2', corrected_text)
+        corrected_text = _CAMEL_CASE_RE.sub(r'\1 \2', corrected_text)
         
         # Add spaces between letters and numbers when appropriate
-        corrected_text = re.sub(r'([a-zA-Z])([0-9])', r'\1 \2', corrected_text)
-        corrected_text = re.sub(r'([0-9])([a-zA-Z])', r'\1 \2', corrected_text)
+        corrected_text = _LETTER_DIGIT_RE.sub(r'\1 \2', corrected_text)
+        corrected_text = _DIGIT_LETTER_RE.sub(r'\1 \2', corrected_text)
         
         # Fix common merged word patterns
-        # Example: "loadingmaterial" -> "loading material"
-        common_word_patterns = [
-            (r'loading([a-z])', r'loading \1'),
-            (r'material([a-z])', r'material \1'),
-            (r'concrete([a-z])', r'concrete \1'),
-            (r'excavation([a-z])', r'excavation \1'),
-            (r'construction([a-z])', r'construction \1'),
-            (r'equipment([a-z])', r'equipment \1'),
-            (r'([a-z])work', r'\1 work'),
-            (r'([a-z])site', r'\1 site'),
-            (r'([a-z])area', r'\1 area'),
-            (r'([a-z])operation', r'\1 operation'),
-        ]
-        
-        for pattern, replacement in common_word_patterns:
-            corrected_text = re.sub(pattern, replacement, corrected_text, flags=re.IGNORECASE)
+        corrected_text = _MERGED_PREFIX_RE.sub(_split_after, corrected_text)
+        corrected_text = _MERGED_SUFFIX_RE.sub(_split_before, corrected_text)
         
         return corrected_text
     
     def extract_metadata(self, uploaded_file) -> Dict:
         """Extract metadata from PDF"""
         try:
-            uploaded_file.seek(0)
-            pdf_document = fitz.open(stream=uploaded_file.read(), filetype="pdf")
+            pdf_document = fitz.open(stream=self._read_pdf_bytes(uploaded_file), filetype="pdf")
             
             metadata = {
                 'title': pdf_document.metadata.get('title', ''),
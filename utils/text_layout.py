@@ -0,0 +1,99 @@
+"""Text measurement and word wrapping for the PDF generator
+
+Self-contained and fully annotated, so it can optionally be compiled with
+mypyc (see README); the pure-Python module is used when it isn't.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+WRAP_FONT = "Helvetica"
+ELLIPSIS = "..."
+
+
+@lru_cache(maxsize=4096)
+def string_width(text: str, font_name: str, font_size: float) -> float:
+    """canvas.stringWidth memoized across PDFs; table cells repeat the same strings"""
+    return stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=None)
+def char_widths(font_name: str, font_size: float) -> Dict[str, float]:
+    """Shared per-character width table for a font and size, filled on use
+
+    The standard fonts have no kerning, so a string's width is the sum of
+    its characters' widths.
+    """
+    return {}
+
+
+@lru_cache(maxsize=4096)
+def wrap_lines(text: str, max_width: float, font_size: float, max_lines: int) -> Tuple[str, ...]:
+    """Greedy word wrap in Helvetica; a tuple of at most max_lines lines
+
+    Overflowing text ends in "...". Memoized across PDFs, since the same
+    names and descriptions recur from one diary to the next.
+    """
+    # Fast path: blank text, or text that fits on one line as a whole
+    # (widths are additive, so one measurement decides it)
+    words = text.split()
+    if not words:
+        return ()
+    line = ' '.join(words)
+    if string_width(line, WRAP_FONT, font_size) <= max_width:
+        return (line,)
+
+    # Single left-to-right scan keeping a running line width; each word
+    # is measured once (memoized) and lines are only joined when complete
+    space_width = string_width(" ", WRAP_FONT, font_size)
+    lines: List[str] = []
+    current_line: List[str] = []
+    current_width = 0.0
+    truncated = False
+
+    for word in words:
+        word_width = string_width(word, WRAP_FONT, font_size)
+        needed = space_width + word_width if current_line else word_width
+        if current_width + needed <= max_width:
+            current_line.append(word)
+            current_width += needed
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width
+            if len(lines) >= max_lines:
+                truncated = True
+                break
+
+    if current_line and len(lines) < max_lines:
+        lines.append(' '.join(current_line))
+
+    # Add ellipsis if text was truncated; done before drawing so the
+    # last line isn't drawn twice
+    if truncated:
+        lines[-1] = fit_with_ellipsis(lines[-1], max_width, font_size)
+
+    return tuple(lines)
+
+
+def fit_with_ellipsis(line: str, max_width: float, font_size: float) -> str:
+    """Longest prefix of `line` that fits in max_width with "..." appended
+
+    One pass summing per-character widths; the only slice is the result.
+    Returns the line unchanged if not even one character fits.
+    """
+    widths = char_widths(WRAP_FONT, font_size)
+    room = max_width - string_width(ELLIPSIS, WRAP_FONT, font_size)
+    used = 0.0
+    fit = len(line)
+    for i, char in enumerate(line):
+        width = widths.get(char)
+        if width is None:
+            width = widths[char] = stringWidth(char, WRAP_FONT, font_size)
+        used += width
+        if used > room:
+            fit = i
+            break
+    return line[:fit] + ELLIPSIS if fit else line